@@ -4,21 +4,14 @@ Simple script to run the crawler with API health check bypass
 """
 import os
 import sys
-import subprocess
+import runpy
 
 # Set environment variable to bypass API health check
 os.environ["FORCE_API_HEALTHY"] = "true"
 
-# Forward all arguments to run_crawler_debug.py
-args = sys.argv[1:]
-cmd = ["python", "run_crawler_debug.py"] + args
+# Forward all arguments to run_crawler_debug.py, run in this interpreter
+script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_crawler_debug.py")
+sys.argv = [script] + sys.argv[1:]
 
-print(f"Running command with API health check bypass: {' '.join(cmd)}")
-try:
-    subprocess.run(cmd, check=True)
-except subprocess.CalledProcessError as e:
-    print(f"Crawler failed with error code: {e.returncode}")
-    sys.exit(1)
-except KeyboardInterrupt:
-    print("\nCrawler interrupted by user")
-    sys.exit(130)
\ No newline at end of file
+print(f"Running with API health check bypass: {' '.join(sys.argv)}")
+runpy.run_path(script, run_name="__main__")
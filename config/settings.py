@@ -2,6 +2,7 @@
 Configuration settings for the college website crawler
 """
 import os
+import types
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,22 +20,72 @@ HF_API_ENDPOINTS = {
     "process_batch": f"{HF_API_BASE_URL}/process/batch"
 }
 
+# Requests to the single-item endpoints are coalesced into /process/batch calls
+HF_BATCH_SIZE = 16  # flush a batch as soon as it holds this many items
+HF_BATCH_FLUSH_INTERVAL = 0.05  # seconds to wait for more items before flushing
+HF_BATCH_TIMEOUT = 60  # seconds allowed for one batch request
+IMAGE_AI_CACHE_ITEMS = 2048  # image API results ImageExtractor keeps, per call and unchanged file
+
 # MongoDB Configuration
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
 MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "college_data")
 MONGODB_RAW_COLLECTION = "raw_data"
 MONGODB_PROCESSED_COLLECTION = "processed_data"
+RAW_DATA_BATCH_SIZE = 100  # raw documents buffered per insert_many
 
 # Crawler Settings
 MAX_PAGES_PER_COLLEGE = 50
 MAX_DEPTH = 3
+CRAWL_CONCURRENCY = 20  # pages of one college processed at the same time
+CPU_POOL_WORKERS = os.cpu_count() or 1  # threads used for parsing and page analysis
+DOWNLOAD_CONCURRENCY = 8  # embedded images/files downloaded at the same time
+URL_FILTER_CAPACITY = 100000  # initial size of the Bloom filters used for URL dedupe
+URL_FILTER_ERROR_RATE = 1e-6  # chance a new URL is wrongly treated as already seen
 TIMEOUT = 30  # seconds
+PAGE_SETTLE_TIMEOUT = 3000  # ms to wait for network idle / ready selector after load
+
+# A page this small with this many scripts is treated as a JavaScript app shell
+JS_SHELL_MAX_BYTES = 2048
+JS_SHELL_MIN_SCRIPTS = 3
 HEADLESS = True  # Run browser in headless mode
 
+# Subresource types the browser never downloads (only HTML and links are used).
+# File downloads go through a separate navigation and are not affected.
+BLOCKED_RESOURCE_TYPES = [
+    "image", "stylesheet", "font", "media",
+    "texttrack", "beacon", "csp_report", "imageset"
+]
+
 # Request Settings
 REQUEST_TIMEOUT = 15  # seconds
 MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.3  # seconds, doubled on every retry
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
 USER_AGENT_ROTATION = True
+USER_AGENT_POOL_SIZE = 64  # User agents sampled once at startup and rotated
+
+# HTTP Connection Pool Settings (plain HTTP crawling)
+HTTP_POOL_LIMIT = 100  # Total open connections
+HTTP_POOL_LIMIT_PER_HOST = 4  # Open connections per host
+HTTP_KEEPALIVE_TIMEOUT = 75  # seconds an idle connection is kept for reuse
+DNS_CACHE_TTL = 3600  # seconds a resolved host is cached in memory
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # bytes written to disk per chunk when downloading files
+
+# HTML parsing off the event loop (plain HTTP crawling)
+PARSE_POOL_WORKERS = os.cpu_count() or 1  # processes used to parse large pages
+PARSE_OFFLOAD_MIN_BYTES = 200 * 1024  # smaller pages are parsed inline, IPC would cost more
+
+# PDF extraction
+PDF_POOL_WORKERS = min(os.cpu_count() or 1, 4)  # processes extracting the pages of one PDF
+PDF_PAGES_PER_TASK = 10  # most pages handed to a worker process at a time (fewer for short PDFs)
+PDF_PARALLEL_MIN_PAGES = 4  # smaller PDFs are extracted in-process, starting workers would cost more
+PDF_DOC_CACHE_ITEMS = 4  # open documents PDFExtractor keeps for repeated calls on the same file
+
+# HTTP response cache (plain HTTP crawling)
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_PATH = os.path.join("cache", "http_cache.sqlite")
+HTTP_CACHE_EXPIRE_AFTER = 0  # seconds a page is reused without asking the server (0: always revalidate)
+HTTP_CACHE_MEMORY_ITEMS = 256  # most recently used pages kept in memory
 
 # Delay Settings (for anti-crawling measures)
 MIN_DELAY = 3  # seconds
@@ -44,10 +95,17 @@ RANDOM_DELAY = True
 # Proxy Settings
 USE_PROXIES = False
 PROXY_ROTATION_FREQUENCY = 10  # Rotate after every 10 requests
+PROXY_VERIFY_LIMIT = 20  # candidate proxies tested (at once) when loading the list
+MIN_PROXIES = 10  # verified proxies after which the remaining list sources are skipped
+PROXY_CONNECT_TIMEOUT = 2  # seconds for the TCP probe that weeds out dead proxies
+PROXY_CACHE_PATH = os.path.join("cache", "proxies.json")  # last verified proxy list
+PROXY_CACHE_TTL = 600  # seconds a saved proxy list is reused instead of refetched
 
 # Log Settings
 LOG_LEVEL = "INFO"
 LOG_FILE = "crawler.log"
+BROWSER_EVENT_LOG_SIZE = 10000  # browser request/response events buffered at DEBUG level
+BROWSER_EVENT_LOG_INTERVAL = 0.5  # seconds between flushes of buffered browser events
 
 # Target Keywords
 ADMISSION_KEYWORDS = [
@@ -78,4 +136,9 @@ CONTENT_TYPES = {
     "doc": ["application/msword", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"],
     "image": ["image/jpeg", "image/png", "image/gif", "image/webp"],
     "excel": ["application/vnd.ms-excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"]
-}
\ No newline at end of file
+}
+
+# Reverse lookup: MIME type -> content category, built once at import
+MIME_TO_CATEGORY = types.MappingProxyType({
+    mime: category for category, mimes in CONTENT_TYPES.items() for mime in mimes
+})
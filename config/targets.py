@@ -1,6 +1,10 @@
 """
 Target college websites and their specific URL patterns
 """
+import re
+from functools import lru_cache
+from typing import Dict, Any, Optional
+from urllib.parse import urljoin
 
 # List of target colleges with their base URLs and specific paths
 TARGET_COLLEGES = [
@@ -18,7 +22,8 @@ TARGET_COLLEGES = [
             "placement",
             "training-placement"
         ],
-        "domain": "iitd.ac.in"
+        "domain": "iitd.ac.in",
+        "requires_js": False
     },
     {
         "name": "Indian Institute of Technology Bombay",
@@ -34,7 +39,8 @@ TARGET_COLLEGES = [
             "placement",
             "careers"
         ],
-        "domain": "iitb.ac.in"
+        "domain": "iitb.ac.in",
+        "requires_js": False
     },
     {
         "name": "Delhi University",
@@ -50,7 +56,8 @@ TARGET_COLLEGES = [
             "careers",
             "CIC/index.php"
         ],
-        "domain": "du.ac.in"
+        "domain": "du.ac.in",
+        "requires_js": True
     },
     {
         "name": "Vellore Institute of Technology",
@@ -66,7 +73,8 @@ TARGET_COLLEGES = [
             "campus-placements",
             "careers"
         ],
-        "domain": "vit.ac.in"
+        "domain": "vit.ac.in",
+        "requires_js": True
     },
     {
         "name": "Birla Institute of Technology and Science, Pilani",
@@ -82,7 +90,8 @@ TARGET_COLLEGES = [
             "placements",
             "careers"
         ],
-        "domain": "bits-pilani.ac.in"
+        "domain": "bits-pilani.ac.in",
+        "requires_js": False
     },
     # Add your own custom college here as an example
     {
@@ -97,10 +106,52 @@ TARGET_COLLEGES = [
             "careers",
             "jobs"
         ],
-        "domain": "example.edu"
+        "domain": "example.edu",
+        "requires_js": False
     }
 ]
 
+# Seed URLs joined once instead of on every crawl
+for _college in TARGET_COLLEGES:
+    _college["admission_urls"] = [urljoin(_college["base_url"], p) for p in _college.get("admission_paths", [])]
+    _college["placement_urls"] = [urljoin(_college["base_url"], p) for p in _college.get("placement_paths", [])]
+del _college
+
+# Lookup indexes over TARGET_COLLEGES
+COLLEGES_BY_DOMAIN = {c["domain"]: c for c in TARGET_COLLEGES}
+COLLEGES_BY_ALIAS = {
+    a.lower(): c for c in TARGET_COLLEGES for a in (c.get("alias", []) + [c["name"]])
+}
+
+def get_by_domain(domain: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a target college by domain, including its subdomains
+    
+    Args:
+        domain: Domain or host name (e.g. 'www.iitd.ac.in')
+        
+    Returns:
+        College dictionary or None if not a target
+    """
+    domain = domain.lower()
+    while domain:
+        if domain in COLLEGES_BY_DOMAIN:
+            return COLLEGES_BY_DOMAIN[domain]
+        _, _, domain = domain.partition(".")
+    return None
+
+def get_by_alias(alias: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a target college by exact name or alias (case-insensitive)
+    
+    Args:
+        alias: College name or alias
+        
+    Returns:
+        College dictionary or None if no exact match
+    """
+    return COLLEGES_BY_ALIAS.get(alias.strip().lower())
+
 # Custom URL patterns for extracting specific data
 CUSTOM_URL_PATTERNS = {
     "admission_patterns": [
@@ -119,6 +170,35 @@ CUSTOM_URL_PATTERNS = {
     ]
 }
 
+# Each pattern list compiled once into a single alternation, so a URL is
+# classified with one regex scan instead of one scan per pattern
+ADMISSION_URL_RE = re.compile(
+    "|".join(f"(?:{p})" for p in CUSTOM_URL_PATTERNS["admission_patterns"]),
+    re.IGNORECASE
+)
+PLACEMENT_URL_RE = re.compile(
+    "|".join(f"(?:{p})" for p in CUSTOM_URL_PATTERNS["placement_patterns"]),
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=4096)
+def classify_url_path(path: str) -> Optional[str]:
+    """
+    Classify a URL path by the custom URL patterns (memoized - the same
+    navigation links show up on almost every page of a site)
+    
+    Args:
+        path: Path component of a URL
+        
+    Returns:
+        'placement', 'admission' or None (placement wins when both match)
+    """
+    if PLACEMENT_URL_RE.search(path):
+        return "placement"
+    if ADMISSION_URL_RE.search(path):
+        return "admission"
+    return None
+
 # Specific keywords to look for in page content
 PAGE_CONTENT_INDICATORS = {
     "admission": [
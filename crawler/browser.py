@@ -6,13 +6,209 @@ import random
 import time
 import os
 import asyncio
-from typing import Dict, List, Any, Optional
-from playwright.async_api import async_playwright, Browser, Page, Response
+import re
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+import aiohttp
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Response
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Error as PlaywrightError
 from fake_useragent import UserAgent
-from urllib.parse import urljoin
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+# aiohttp decodes brotli responses only when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+from config.settings import (
+    REQUEST_TIMEOUT,
+    MAX_RETRIES,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_STATUS_CODES,
+    USER_AGENT_ROTATION,
+    USER_AGENT_POOL_SIZE,
+    BLOCKED_RESOURCE_TYPES,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+    DNS_CACHE_TTL,
+    DOWNLOAD_CHUNK_SIZE,
+    PAGE_SETTLE_TIMEOUT,
+    JS_SHELL_MAX_BYTES,
+    JS_SHELL_MIN_SCRIPTS,
+    BROWSER_EVENT_LOG_SIZE,
+    BROWSER_EVENT_LOG_INTERVAL,
+    PARSE_POOL_WORKERS,
+    PARSE_OFFLOAD_MIN_BYTES,
+    HTTP_CACHE_ENABLED,
+    HTTP_CACHE_PATH,
+    MIN_DELAY,
+    MAX_DELAY,
+    RANDOM_DELAY
+)
+from crawler.urlutils import cached_urlparse, fast_urljoin, split_file_links
+from crawler.httpcache import HTTPCache
 
 logger = logging.getLogger(__name__)
 
+_NOSCRIPT_RE = re.compile(r'<noscript\b[^>]*>(.*?)</noscript>', re.IGNORECASE | re.DOTALL)
+_SCRIPT_TAG_RE = re.compile(r'<script\b', re.IGNORECASE)
+
+def needs_javascript(html: str) -> bool:
+    """
+    Guess whether a page only renders its content with JavaScript
+    
+    Args:
+        html: HTML returned by a plain HTTP fetch
+        
+    Returns:
+        True if the page asks for JavaScript or is a tiny script-only shell
+    """
+    for noscript in _NOSCRIPT_RE.findall(html):
+        if 'enable javascript' in noscript.lower():
+            return True
+    return len(html) < JS_SHELL_MAX_BYTES and len(_SCRIPT_TAG_RE.findall(html)) >= JS_SHELL_MIN_SCRIPTS
+
+def _temp_download_path(downloads_dir: str) -> str:
+    """
+    Reserve a temporary file in the downloads directory
+    
+    Args:
+        downloads_dir: Directory to create the file in
+        
+    Returns:
+        Path of the new empty file
+    """
+    fd, path = tempfile.mkstemp(dir=downloads_dir, suffix=".part")
+    os.close(fd)
+    return path
+
+@lru_cache(maxsize=64)
+def _compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """
+    Compile a CSS selector for BeautifulSoup once and reuse it
+    
+    Args:
+        selector: CSS selector
+        
+    Returns:
+        Compiled soupsieve selector
+    """
+    return soupsieve.compile(selector)
+
+def _extract_hrefs(html: str, selector: str) -> List[Optional[str]]:
+    """
+    Collect href attributes of elements matching a selector
+    
+    Top-level so it can run in a worker process.
+    
+    Args:
+        html: HTML content
+        selector: CSS selector for links
+        
+    Returns:
+        List of href values (None where the attribute is missing)
+    """
+    if HAS_SELECTOLAX:
+        return [node.attrs.get('href') for node in LexborHTMLParser(html).css(selector)]
+    
+    # Plain anchor selectors only need the <a> tags built into the tree
+    strainer = SoupStrainer('a') if selector.split('[', 1)[0] == 'a' else None
+    soup = BeautifulSoup(html, 'lxml', parse_only=strainer)
+    return [element.get('href') for element in _compile_selector(selector).select(soup)]
+
+class BrowserPool:
+    """Single Playwright browser shared by all BrowserManager instances"""
+    
+    _playwright = None
+    _browser = None
+    _lock = None
+    
+    @classmethod
+    async def get_browser(cls, headless: bool = True) -> Browser:
+        """
+        Get the shared browser, launching it on first use
+        
+        Args:
+            headless: Whether to run browser in headless mode (first launch only)
+            
+        Returns:
+            Playwright browser object
+        """
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        
+        async with cls._lock:
+            if cls._browser is None or not cls._browser.is_connected():
+                if cls._playwright is None:
+                    cls._playwright = await async_playwright().start()
+                
+                cls._browser = await cls._playwright.chromium.launch(headless=headless)
+                logger.info("Shared browser launched")
+        
+        return cls._browser
+    
+    @classmethod
+    async def acquire_context(
+        cls,
+        headless: bool = True,
+        proxy: Optional[str] = None,
+        **context_options
+    ) -> BrowserContext:
+        """
+        Create a fresh browser context on the shared browser
+        
+        Args:
+            headless: Whether to run browser in headless mode (first launch only)
+            proxy: Optional proxy server URL for this context
+            context_options: Extra options passed to Browser.new_context
+            
+        Returns:
+            Playwright browser context
+        """
+        browser = await cls.get_browser(headless)
+        
+        if proxy:
+            context_options['proxy'] = {'server': proxy}
+        
+        return await browser.new_context(**context_options)
+    
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close the shared browser and stop Playwright"""
+        try:
+            if cls._browser:
+                await cls._browser.close()
+            
+            if cls._playwright:
+                await cls._playwright.stop()
+            
+            logger.info("Shared browser closed successfully")
+            
+        except Exception as e:
+            logger.error(f"Error closing shared browser: {e}")
+        finally:
+            cls._browser = None
+            cls._playwright = None
+            cls._lock = None
+
 class BrowserManager:
     """Browser manager for automated website navigation"""
     
@@ -26,14 +222,19 @@ class BrowserManager:
         """
         self.use_proxies = use_proxies
         self.headless = headless
-        self.playwright = None
-        self.browser = None
         self.context = None
         self.page = None
         self.user_agent = UserAgent()
         self.current_proxy = None
         self.downloads_dir = os.path.join(os.getcwd(), "downloads")
         
+        # JSON payloads the current page fetched from its backend
+        self._captured_json: List[Dict[str, Any]] = []
+        
+        # Network events are buffered and logged in batches (DEBUG only)
+        self._event_log = deque(maxlen=BROWSER_EVENT_LOG_SIZE)
+        self._event_flusher = None
+        
         # Create downloads directory if it doesn't exist
         os.makedirs(self.downloads_dir, exist_ok=True)
         
@@ -48,66 +249,119 @@ class BrowserManager:
             Playwright page object
         """
         try:
-            self.playwright = await async_playwright().start()
-            
             # Generate a random user agent
             user_agent_string = self.user_agent.random
             
-            # Configure browser options
-            browser_args = []
-            
             # Add proxy if needed
+            proxy_url = None
             if self.use_proxies and self.current_proxy:
-                proxy_url = f"{self.current_proxy['protocol']}://{self.current_proxy['ip']}:{self.current_proxy['port']}"
+                proxy_url = self.current_proxy.url
                 logger.info(f"Using proxy: {proxy_url}")
-                browser_args.append(f"--proxy-server={proxy_url}")
             
-            # Launch browser
-            self.browser = await self.playwright.chromium.launch(
+            # Create context with custom user-agent on the shared browser
+            self.context = await BrowserPool.acquire_context(
                 headless=self.headless,
-                args=browser_args
-            )
-            
-            # Create context with custom user-agent
-            self.context = await self.browser.new_context(
+                proxy=proxy_url,
                 user_agent=user_agent_string,
                 viewport={'width': 1366, 'height': 768},
                 accept_downloads=True
             )
             
-            # Add event listeners for debugging
-            self.context.on("request", self._on_request)
-            self.context.on("response", self._on_response)
+            # Add event listeners for debugging - not attached at all unless
+            # DEBUG logging is on, since every subresource fires them
+            if logger.isEnabledFor(logging.DEBUG):
+                self.context.on("request", self._on_request)
+                self.context.on("response", self._on_response)
+                self._event_flusher = asyncio.create_task(self._flush_event_log())
+            
+            # Skip images, stylesheets, fonts etc. - only the HTML is used
+            if BLOCKED_RESOURCE_TYPES:
+                await self.context.route("**/*", self._block_heavy_resources)
             
             # Create new page
             self.page = await self.context.new_page()
             
+            # Keep the JSON the page loads so callers can skip DOM scraping
+            self.page.on("response", self._capture_json)
+            
             logger.info(f"Browser initialized with user agent: {user_agent_string}")
             return self.page
             
         except Exception as e:
             logger.error(f"Error initializing browser: {e}")
-            if self.playwright:
-                await self.playwright.stop()
+            if self.context:
+                await self.context.close()
+                self.context = None
             
             # Re-raise exception to be handled by caller
             raise
     
+    async def _block_heavy_resources(self, route):
+        """Abort requests for subresources the crawler never uses"""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _capture_json(self, response: Response) -> None:
+        """Store the body of XHR/fetch responses that carry JSON"""
+        try:
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if "json" not in response.headers.get("content-type", ""):
+                return
+            
+            self._captured_json.append({
+                'url': response.url,
+                'status': response.status,
+                'data': await response.json()
+            })
+        except Exception as e:
+            logger.debug(f"Could not capture JSON from {response.url}: {e}")
+    
+    def get_captured_json(self) -> List[Dict[str, Any]]:
+        """
+        Get the JSON API responses captured during the last navigation
+        
+        Returns:
+            List of dicts with 'url', 'status' and 'data' keys
+        """
+        return list(self._captured_json)
+    
     def _on_request(self, request):
-        """Handle request events for debugging"""
-        logger.debug(f"Request: {request.method} {request.url}")
+        """Buffer request events for debugging"""
+        self._event_log.append(f"Request: {request.method} {request.url}")
     
     def _on_response(self, response):
-        """Handle response events for debugging"""
-        logger.debug(f"Response: {response.status} {response.url}")
+        """Buffer response events for debugging"""
+        self._event_log.append(f"Response: {response.status} {response.url}")
     
-    async def navigate(self, url: str, wait_for_load: bool = True) -> Dict[str, Any]:
+    async def _flush_event_log(self) -> None:
+        """Periodically write buffered network events as one log record"""
+        try:
+            while True:
+                await asyncio.sleep(BROWSER_EVENT_LOG_INTERVAL)
+                self._write_event_log()
+        except asyncio.CancelledError:
+            self._write_event_log()
+            raise
+    
+    def _write_event_log(self) -> None:
+        """Log and clear the buffered network events"""
+        if self._event_log:
+            batch = list(self._event_log)
+            self._event_log.clear()
+            logger.debug("\n".join(batch))
+    
+    async def navigate(self, url: str, wait_for_load: bool = True,
+                       ready_selector: Optional[str] = None) -> Dict[str, Any]:
         """
         Navigate to a specific URL
         
         Args:
             url: URL to navigate to
             wait_for_load: Whether to wait for page load
+            ready_selector: CSS selector that marks the page as ready (network idle if None)
             
         Returns:
             Dict with page info
@@ -130,11 +384,18 @@ class BrowserManager:
             
             # Navigate to URL
             logger.info(f"Navigating to {url}")
+            self._captured_json = []
             response = await self.page.goto(url, wait_until='domcontentloaded' if wait_for_load else 'commit')
             
-            # Wait a bit more for JavaScript execution
+            # Wait for JavaScript to settle, but no longer than needed
             if wait_for_load:
-                await asyncio.sleep(2)
+                try:
+                    if ready_selector:
+                        await self.page.wait_for_selector(ready_selector, timeout=PAGE_SETTLE_TIMEOUT)
+                    else:
+                        await self.page.wait_for_load_state('networkidle', timeout=PAGE_SETTLE_TIMEOUT)
+                except PlaywrightTimeoutError:
+                    logger.debug(f"Page did not settle within {PAGE_SETTLE_TIMEOUT} ms: {url}")
                 
             result['status'] = response.status
             result['url'] = self.page.url
@@ -151,7 +412,7 @@ class BrowserManager:
             result['content'] = f"Error: {str(e)}"
             return result
     
-    async def get_links(self, selector: str = 'a[href]') -> List[str]:
+    async def get_links(self, selector: str = 'a[href]') -> Tuple[List[str], List[str]]:
         """
         Extract links from the current page
         
@@ -159,13 +420,13 @@ class BrowserManager:
             selector: CSS selector for links
             
         Returns:
-            List of URLs
+            Tuple of (page URLs, downloadable file URLs)
         """
         links = []
         try:
             if not self.page:
                 logger.error("Browser not initialized")
-                return links
+                return links, []
                 
             # Get all href attributes from elements matching the selector
             hrefs = await self.page.eval_on_selector_all(
@@ -177,23 +438,27 @@ class BrowserManager:
                 if href and href.startswith('http'):
                     links.append(href)
                     
-            logger.debug(f"Extracted {len(links)} links from page")
-            return links
+            # Files go to download_file, never through navigate
+            page_links, file_links = split_file_links(links)
+            logger.debug(f"Extracted {len(page_links)} page links and {len(file_links)} file links")
+            return page_links, file_links
             
         except Exception as e:
             logger.error(f"Error extracting links: {e}")
-            return links
+            return links, []
     
-    async def download_file(self, url: str) -> Optional[bytes]:
+    async def download_file(self, url: str, dest_path: Optional[str] = None) -> Optional[str]:
         """
-        Download a file from a URL
+        Download a file from a URL straight to disk
         
         Args:
             url: URL of the file to download
+            dest_path: Where to save the file (temporary file in downloads dir if None)
             
         Returns:
-            File content as bytes or None if download failed
+            Path of the downloaded file or None if download failed
         """
+        download_page = None
         try:
             if not self.context:
                 await self.init_browser()
@@ -201,33 +466,34 @@ class BrowserManager:
             # Create a special page just for download
             download_page = await self.context.new_page()
             
-            # Start download and wait for download to start
-            download_task = asyncio.create_task(
-                self.context.wait_for_event("download")
-            )
+            # Wait for the download of this page only - several downloads can
+            # run at once, and context-wide events would mix them up
+            async with download_page.expect_download() as download_info:
+                try:
+                    await download_page.goto(url)
+                except PlaywrightError as e:
+                    # The navigation is aborted once the response turns into a download
+                    if "Download is starting" not in str(e):
+                        raise
+            download = await download_info.value
             
-            # Navigate to download URL
-            await download_page.goto(url)
+            # Save directly to the destination instead of reading it into memory
+            path = dest_path or _temp_download_path(self.downloads_dir)
+            await download.save_as(path)
             
-            # Wait for download to start
-            download = await download_task
-            
-            # Save to a temporary path
-            temp_path = await download.path()
-            
-            # Read file content
-            with open(temp_path, 'rb') as f:
-                file_content = f.read()
-            
-            # Close the special page
-            await download_page.close()
-            
-            logger.info(f"Downloaded file from {url} ({len(file_content)} bytes)")
-            return file_content
+            logger.info(f"Downloaded file from {url} ({os.path.getsize(path)} bytes)")
+            return path
             
         except Exception as e:
             logger.error(f"Error downloading file from {url}: {e}")
             return None
+        finally:
+            # Close the special page
+            if download_page is not None:
+                try:
+                    await download_page.close()
+                except Exception as e:
+                    logger.debug(f"Error closing download page for {url}: {e}")
         
     async def take_screenshot(self, path: str) -> bool:
         """
@@ -253,21 +519,408 @@ class BrowserManager:
             return False
     
     async def close(self) -> None:
-        """Close browser and release resources"""
+        """Close page and context (the shared browser stays open)"""
         try:
+            if self._event_flusher:
+                self._event_flusher.cancel()
+                await asyncio.gather(self._event_flusher, return_exceptions=True)
+                self._event_flusher = None
+            
             if self.page:
                 await self.page.close()
                 
             if self.context:
                 await self.context.close()
                 
-            if self.browser:
-                await self.browser.close()
+            logger.info("Browser resources closed successfully")
+            
+        except Exception as e:
+            logger.error(f"Error closing browser: {e}")
+
+class SimpleBrowser:
+    """Lightweight HTTP-only browser for pages that do not need JavaScript"""
+    
+    def __init__(self, use_proxies: bool = False, proxy_manager=None):
+        """
+        Initialize simple browser
+        
+        Args:
+            use_proxies: Whether to use proxy rotation
+            proxy_manager: ProxyManager to get a new proxy from when the current one fails
+        """
+        self.use_proxies = use_proxies
+        self.proxy_manager = proxy_manager
+        self.session = None
+        self.user_agent = UserAgent()
+        self.current_proxy = None
+        self.current_url = None
+        self.current_content = ''
+        self._parsed_tree = None
+        self._parsed_content = None
+        self._parse_pool = None
+        self._cache = None
+        self.downloads_dir = os.path.join(os.getcwd(), "downloads")
+        
+        # Sample user agents once instead of on every request
+        pool_size = USER_AGENT_POOL_SIZE if USER_AGENT_ROTATION else 1
+        self._ua_pool = [self.user_agent.random for _ in range(pool_size)]
+        self._ua_idx = 0
+        
+        # Per-host politeness state: only requests to the same host wait
+        # for each other, different hosts are fetched concurrently
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_next_ok: Dict[str, float] = {}
+        
+        # Create downloads directory if it doesn't exist
+        os.makedirs(self.downloads_dir, exist_ok=True)
+        
+        self.headers = {
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Cache-Control': 'max-age=0'
+        }
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the shared aiohttp session"""
+        if self.session is None or self.session.closed:
+            # Keep connections alive so repeated requests to the same host
+            # reuse the TCP/TLS connection instead of handshaking again
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                force_close=False,
+                resolver=self._get_resolver(),
+                use_dns_cache=True,
+                ttl_dns_cache=DNS_CACHE_TTL
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            )
+        return self.session
+    
+    def _get_resolver(self) -> aiohttp.abc.AbstractResolver:
+        """Get a non-blocking DNS resolver, falling back to the threaded one"""
+        try:
+            # AsyncResolver needs aiodns; only use it when it's installed
+            import aiodns
+            return aiohttp.AsyncResolver()
+        except ImportError:
+            return aiohttp.ThreadedResolver()
+    
+    def _next_user_agent(self) -> str:
+        """Get the next user agent from the pre-sampled pool"""
+        user_agent = self._ua_pool[self._ua_idx % len(self._ua_pool)]
+        self._ua_idx += 1
+        return user_agent
+    
+    async def _wait_for_host(self, url: str) -> None:
+        """
+        Wait until the politeness delay for the URL's host has passed
+        
+        Args:
+            url: URL about to be fetched
+        """
+        host = cached_urlparse(url).netloc
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        
+        async with lock:
+            loop = asyncio.get_running_loop()
+            wait = max(0, self._host_next_ok.get(host, 0) - loop.time())
+            if wait:
+                wait += random.uniform(0, 0.1)
+                logger.debug(f"Waiting {wait:.2f} seconds before next request to {host}")
+                await asyncio.sleep(wait)
+            
+            # Reserve the next slot for this host
+            delay = random.uniform(MIN_DELAY, MAX_DELAY) if RANDOM_DELAY else MIN_DELAY
+            self._host_next_ok[host] = loop.time() + delay
+    
+    async def init_browser(self) -> aiohttp.ClientSession:
+        """
+        Initialize the HTTP session
+        
+        Returns:
+            aiohttp client session
+        """
+        return await self._get_session()
+    
+    async def navigate(self, url: str, wait_for_load: bool = True,
+                       ready_selector: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch a specific URL
+        
+        Args:
+            url: URL to fetch
+            wait_for_load: Unused, kept for interface parity with BrowserManager
+            ready_selector: Unused, kept for interface parity with BrowserManager
+            
+        Returns:
+            Dict with page info
+        """
+        result = {
+            'success': False,
+            'url': url,
+            'content': '',
+            'status': 0
+        }
+        
+        cached = None
+        try:
+            # sqlite reads and writes run in threads so the other fetches keep going
+            cache = await self._get_cache()
+            cached = await asyncio.to_thread(cache.get, url) if cache else None
+            if cached and cache.is_fresh(cached):
+                logger.debug(f"Serving {url} from cache")
+                return self._use_cached(result, cached)
+            
+            session = await self._get_session()
+            
+            # Politeness delay between requests to the same host
+            await self._wait_for_host(url)
+            
+            headers = {'User-Agent': self._next_user_agent()}
+            if cached:
+                headers.update(cache.validators(cached))
+            
+            logger.info(f"Fetching {url}")
+            for attempt in range(MAX_RETRIES + 1):
+                async with session.get(url, headers=headers, proxy=self._proxy_url()) as response:
+                    result['status'] = response.status
+                    result['url'] = str(response.url)
+                    
+                    if response.status == 304 and cached:
+                        logger.debug(f"Not modified: {url}")
+                        await asyncio.to_thread(cache.touch, url, cached)
+                        return self._use_cached(result, cached)
+                    
+                    if response.status == 200:
+                        result['content'] = await response.text(errors='replace')
+                        result['success'] = True
+                        self.current_url = result['url']
+                        self.current_content = result['content']
+                        
+                        if cache and 'no-store' not in response.headers.get('Cache-Control', ''):
+                            await asyncio.to_thread(
+                                cache.put, url, result['url'], result['content'],
+                                etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified')
+                            )
+                
+                if response.status not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                    break
+                
+                # Back off before retrying on throttling / server errors
+                backoff = RETRY_BACKOFF_FACTOR * (2 ** attempt)
+                logger.debug(f"Retrying {url} in {backoff:.2f} seconds (Status: {response.status})")
+                await asyncio.sleep(backoff)
+            
+            # Serve a stale copy rather than nothing when the server is failing
+            if cached and result['status'] in RETRY_STATUS_CODES:
+                logger.warning(f"Serving stale cache for {url} (Status: {result['status']})")
+                return self._use_cached(result, cached)
+            
+            logger.info(f"Fetch completed: {url} (Status: {result['status']})")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {e}")
+            await self._rotate_proxy_after(e)
+            if cached:
+                return self._use_cached(result, cached)
+            return result
+    
+    def _proxy_url(self) -> Optional[str]:
+        """Get the URL of the proxy requests should go through (None for direct)"""
+        if self.use_proxies and self.current_proxy:
+            return self.current_proxy.url
+        return None
+    
+    async def _rotate_proxy_after(self, error: Exception) -> None:
+        """
+        Switch to the next proxy if a request failed because of the current one
+        
+        Args:
+            error: Exception raised by the request
+        """
+        if not (self._proxy_url() and self.proxy_manager):
+            return
+        if isinstance(error, (aiohttp.ClientProxyConnectionError, aiohttp.ClientHttpProxyError,
+                              asyncio.TimeoutError)):
+            failed = self.current_proxy
+            self.current_proxy = await asyncio.to_thread(self.proxy_manager.next_proxy)
+            if self.current_proxy:
+                logger.info(f"Proxy {failed.url} failed, switching to {self.current_proxy.url}")
+    
+    async def _get_cache(self) -> Optional[HTTPCache]:
+        """Get or open the response cache (None if caching is disabled)"""
+        if self._cache is None and HTTP_CACHE_ENABLED:
+            cache = await asyncio.to_thread(HTTPCache, HTTP_CACHE_PATH)
+            # Another fetch may have opened it meanwhile
+            if self._cache is None:
+                self._cache = cache
+            else:
+                cache.close()
+        return self._cache
+    
+    def _use_cached(self, result: Dict[str, Any], cached: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fill a navigate result from a cache entry and make it the current page
+        
+        Args:
+            result: Result dict being built by navigate
+            cached: Entry from the response cache
+            
+        Returns:
+            The filled result dict
+        """
+        result['status'] = 200
+        result['url'] = cached['final_url']
+        result['content'] = cached['content']
+        result['success'] = True
+        self.current_url = result['url']
+        self.current_content = result['content']
+        return result
+    
+    def _get_tree(self) -> Any:
+        """
+        Get the parsed tree of the last fetched page, parsing it only once
+        
+        Returns:
+            selectolax LexborHTMLParser
+        """
+        if self._parsed_content is not self.current_content:
+            self._parsed_tree = LexborHTMLParser(self.current_content)
+            self._parsed_content = self.current_content
+        return self._parsed_tree
+    
+    def get_captured_json(self) -> List[Dict[str, Any]]:
+        """
+        Get captured JSON API responses (none without a browser, kept for interface parity)
+        
+        Returns:
+            Empty list
+        """
+        return []
+    
+    async def get_links(self, selector: str = 'a[href]') -> Tuple[List[str], List[str]]:
+        """
+        Extract links from the last fetched page
+        
+        Args:
+            selector: CSS selector for links
+            
+        Returns:
+            Tuple of (page URLs, downloadable file URLs)
+        """
+        links = []
+        try:
+            if not self.current_content:
+                logger.error("No page loaded")
+                return links, []
+            
+            if len(self.current_content) >= PARSE_OFFLOAD_MIN_BYTES:
+                # Parse large pages in a worker process so fetches keep running
+                if self._parse_pool is None:
+                    self._parse_pool = ProcessPoolExecutor(max_workers=PARSE_POOL_WORKERS)
+                loop = asyncio.get_running_loop()
+                hrefs = await loop.run_in_executor(
+                    self._parse_pool, _extract_hrefs, self.current_content, selector
+                )
+            elif HAS_SELECTOLAX:
+                hrefs = [node.attrs.get('href') for node in self._get_tree().css(selector)]
+            else:
+                hrefs = _extract_hrefs(self.current_content, selector)
+            
+            for href in hrefs:
+                if not href:
+                    continue
                 
-            if self.playwright:
-                await self.playwright.stop()
+                full_url = fast_urljoin(self.current_url, href)
+                if full_url.startswith('http'):
+                    links.append(full_url)
+            
+            # Files go to download_file, never through navigate
+            page_links, file_links = split_file_links(links)
+            logger.debug(f"Extracted {len(page_links)} page links and {len(file_links)} file links")
+            return page_links, file_links
+            
+        except Exception as e:
+            logger.error(f"Error extracting links: {e}")
+            return links, []
+    
+    async def download_file(self, url: str, dest_path: Optional[str] = None) -> Optional[str]:
+        """
+        Download a file from a URL, streaming it to disk in chunks
+        
+        Args:
+            url: URL of the file to download
+            dest_path: Where to save the file (temporary file in downloads dir if None)
+            
+        Returns:
+            Path of the downloaded file or None if download failed
+        """
+        path = None
+        try:
+            session = await self._get_session()
+            # PDFs and images are already compressed - don't make the server re-encode them
+            async with session.get(url, headers={'Accept-Encoding': 'identity'},
+                                   proxy=self._proxy_url()) as response:
+                if response.status != 200:
+                    return None
                 
-            logger.info("Browser resources closed successfully")
+                path = dest_path or _temp_download_path(self.downloads_dir)
+                with open(path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            
+            logger.info(f"Downloaded file from {url} ({os.path.getsize(path)} bytes)")
+            return path
             
         except Exception as e:
-            logger.error(f"Error closing browser: {e}")
\ No newline at end of file
+            logger.error(f"Error downloading file from {url}: {e}")
+            await self._rotate_proxy_after(e)
+            if path and os.path.exists(path):
+                os.remove(path)
+            return None
+    
+    async def close(self) -> None:
+        """Close the HTTP session and the parser pool"""
+        try:
+            if self.session and not self.session.closed:
+                await self.session.close()
+            
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(wait=False, cancel_futures=True)
+                self._parse_pool = None
+            
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+            
+            logger.info("HTTP session closed successfully")
+            
+        except Exception as e:
+            logger.error(f"Error closing HTTP session: {e}")
+
+def get_browser(target: Optional[Dict[str, Any]] = None, use_proxies: bool = False,
+                proxy_manager=None):
+    """
+    Pick the cheapest browser backend that can crawl a target
+    
+    Args:
+        target: College dictionary from TARGET_COLLEGES (None means unknown site)
+        use_proxies: Whether to use proxy rotation
+        proxy_manager: ProxyManager SimpleBrowser rotates through on proxy failures
+        
+    Returns:
+        BrowserManager for JavaScript sites or unknown targets, SimpleBrowser otherwise
+    """
+    if target is None or target.get('requires_js', False):
+        return BrowserManager(use_proxies=use_proxies)
+    return SimpleBrowser(use_proxies=use_proxies, proxy_manager=proxy_manager)
@@ -3,7 +3,6 @@ Main crawler engine for navigating and extracting data from college websites
 """
 import logging
 import asyncio
-import re
 import os
 import time
 import json
@@ -11,24 +10,128 @@ from typing import Dict, List, Set, Any, Tuple, Optional
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 import hashlib
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from bson import ObjectId
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    from pybloom_live import ScalableBloomFilter
+    HAS_BLOOM = True
+except ImportError:
+    HAS_BLOOM = False
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
 
 from config.settings import (
     MAX_PAGES_PER_COLLEGE, 
     MAX_DEPTH, 
+    CRAWL_CONCURRENCY,
+    CPU_POOL_WORKERS,
+    DOWNLOAD_CONCURRENCY,
+    URL_FILTER_CAPACITY,
+    URL_FILTER_ERROR_RATE,
+    RAW_DATA_BATCH_SIZE,
     DOMAIN_RESTRICT,
     ADMISSION_KEYWORDS,
     PLACEMENT_KEYWORDS,
     ALLOWED_FILE_TYPES
 )
-from config.targets import TARGET_COLLEGES, CUSTOM_URL_PATTERNS, PAGE_CONTENT_INDICATORS
-from crawler.browser import BrowserManager
+from config.targets import (
+    TARGET_COLLEGES,
+    PAGE_CONTENT_INDICATORS,
+    classify_url_path
+)
+from crawler.browser import BrowserManager, SimpleBrowser, get_browser, needs_javascript
+from crawler.proxy import ProxyManager
+from crawler.urlutils import fast_urljoin, hash64, url_fingerprint
+from utils.helpers import node_text_lines
 from storage.mongodb import MongoDBConnector
 from processors.ai_processor import AIProcessor
 
 logger = logging.getLogger(__name__)
 
+# Lowercased page-type vocabularies, built once at import
+_PAGE_TYPE_TERMS = {
+    "admission_indicators": frozenset(ind.lower() for ind in PAGE_CONTENT_INDICATORS['admission']),
+    "placement_indicators": frozenset(ind.lower() for ind in PAGE_CONTENT_INDICATORS['placement']),
+    "admission_keywords": frozenset(keyword.lower() for keyword in ADMISSION_KEYWORDS),
+    "placement_keywords": frozenset(keyword.lower() for keyword in PLACEMENT_KEYWORDS)
+}
+_ALL_PAGE_TYPE_TERMS = frozenset().union(*_PAGE_TYPE_TERMS.values())
+
+# Common main-content containers, most specific first
+_CONTENT_SELECTORS = (
+    "main", "article", "#content", ".content", "#main-content",
+    ".main-content", "#main", ".main", ".page-content", "#page-content"
+)
+_CONTENT_SELECTOR = ", ".join(_CONTENT_SELECTORS)
+_TEXT_BLOCK_SELECTOR = "p, h1, h2, h3, h4, h5, h6, li"
+
+# Linked files that are downloaded rather than crawled as pages
+_SKIP_EXTENSIONS = ('.pdf', '.doc', '.docx', '.xls', '.xlsx', '.jpg', '.jpeg', '.png', '.gif')
+_FILE_SUFFIXES = tuple(f".{ext}" for ext in ALLOWED_FILE_TYPES)
+
+# Words suggesting an image holds a chart or other data
+_CHART_INDICATORS = ('chart', 'graph', 'data', 'statistics', 'placement', 'admission')
+
+def _build_term_automaton():
+    """
+    Build an Aho-Corasick automaton over all page-type terms
+    
+    Returns:
+        pyahocorasick Automaton, or None if pyahocorasick is not installed
+    """
+    if not HAS_AHOCORASICK:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term in _ALL_PAGE_TYPE_TERMS:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+_TERM_AUTOMATON = _build_term_automaton()
+
+# Fallback matcher: shortest terms first, each with the shorter terms it
+# contains - a term can't occur if one of those didn't
+_TERMS_BY_LENGTH = tuple(
+    (term, tuple(other for other in _ALL_PAGE_TYPE_TERMS if other != term and other in term))
+    for term in sorted(_ALL_PAGE_TYPE_TERMS, key=len)
+)
+
+def _find_page_type_terms(text: str) -> Set[str]:
+    """
+    Find which page-type terms occur in a text
+    
+    Args:
+        text: Lowercased page text
+        
+    Returns:
+        Set of terms present at least once
+    """
+    if _TERM_AUTOMATON is not None:
+        # One pass over the text for all terms
+        return {term for _, term in _TERM_AUTOMATON.iter(text)}
+    found = set()
+    for term, contained in _TERMS_BY_LENGTH:
+        if all(other in found for other in contained) and term in text:
+            found.add(term)
+    return found
+
+def _new_url_set():
+    """
+    Create a container for URL membership checks
+    
+    Returns:
+        Scalable Bloom filter if pybloom_live is installed, otherwise a set
+    """
+    if HAS_BLOOM:
+        return ScalableBloomFilter(initial_capacity=URL_FILTER_CAPACITY, error_rate=URL_FILTER_ERROR_RATE)
+    return set()
+
 class CollegeCrawler:
     """Main crawler engine for college websites"""
     
@@ -44,22 +147,82 @@ class CollegeCrawler:
         self.use_proxies = use_proxies
         self.browser_manager = None
         self.db = MongoDBConnector()
+        
+        # Start fetching and verifying proxies while the crawl is set up
+        self.proxy_manager = None
+        if use_proxies:
+            self.proxy_manager = ProxyManager()
+            self.proxy_manager.prewarm()
         self.ai_processor = AIProcessor()
         
-        # Track visited URLs to avoid duplicates
-        self.visited_urls = set()
-        self.queued_urls = set()
+        # One ID for every document stored by this crawler instance
+        self._session_id = hashlib.md5(f"{time.time()}-{os.getpid()}".encode()).hexdigest()
+        
+        # Track visited URLs to avoid duplicates, as fingerprints of their
+        # canonical form (membership only - Bloom filters have no reliable
+        # len, so pages are counted separately)
+        self.visited_urls = _new_url_set()
+        self.queued_urls = _new_url_set()
+        self.pages_visited = 0
+        self.url_queue = None
+        
+        # Main-text fingerprint -> (raw_id, page_type) of the first page with
+        # that text, kept across colleges to catch mirrored pages
+        self.content_index: Dict[int, Tuple[str, str]] = {}
+        
+        # Playwright drives a single page, so its navigations take turns
+        self._page_lock = asyncio.Lock()
+        self._retired_browsers = []
+        
+        # Embedded files of one page download together, a few at a time
+        self._download_semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+        
+        # Parsing and text analysis run here so they don't stall the event loop
+        self._cpu_pool = ThreadPoolExecutor(max_workers=CPU_POOL_WORKERS)
+        
+        # Raw documents waiting for the next insert_many
+        self._pending_docs = []
         
         # Store file download paths
         self.downloads_dir = "downloads"
         os.makedirs(self.downloads_dir, exist_ok=True)
         
-    async def init_browser(self) -> None:
-        """Initialize browser if needed"""
-        if self.use_browser and not self.browser_manager:
-            self.browser_manager = BrowserManager(use_proxies=self.use_proxies)
+    async def init_browser(self, college: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Initialize browser (Playwright or plain HTTP) if needed
+        
+        Args:
+            college: College being crawled; static sites get plain HTTP even
+                when browser automation is enabled
+        """
+        if self.browser_manager and college is not None and self.use_browser:
+            # Switch backends if the previous college needed the other one
+            if isinstance(self.browser_manager, BrowserManager) != college.get('requires_js', False):
+                await self.browser_manager.close()
+                self.browser_manager = None
+        
+        if not self.browser_manager:
+            if self.use_browser:
+                self.browser_manager = get_browser(
+                    college, use_proxies=self.use_proxies, proxy_manager=self.proxy_manager
+                )
+            else:
+                self.browser_manager = SimpleBrowser(
+                    use_proxies=self.use_proxies, proxy_manager=self.proxy_manager
+                )
+            await self._assign_proxy(self.browser_manager)
             await self.browser_manager.init_browser()
     
+    async def _assign_proxy(self, browser: Any) -> None:
+        """
+        Give a browser backend the current proxy from the proxy manager
+        
+        Args:
+            browser: BrowserManager or SimpleBrowser
+        """
+        if self.proxy_manager:
+            browser.current_proxy = await asyncio.to_thread(self.proxy_manager.get_proxy)
+    
     async def crawl_college(self, college: Dict[str, Any]) -> None:
         """
         Crawl a specific college website
@@ -73,36 +236,48 @@ class CollegeCrawler:
         domain = college.get('domain') or urlparse(base_url).netloc
         
         # Reset tracking for this college
-        self.visited_urls = set()
-        self.queued_urls = set()
-        
-        # Initialize browser if using it
-        if self.use_browser:
-            await self.init_browser()
-        
-        # Start with the base URL
-        await self.process_url(base_url, college_name, domain, page_type="general", depth=0)
+        self.visited_urls = _new_url_set()
+        self.queued_urls = _new_url_set()
+        self.pages_visited = 0
+        self.url_queue = asyncio.Queue()
+        
+        # Initialize browser (or HTTP session)
+        await self.init_browser(college)
+        
+        # Seed with the base URL and the specific admission and placement paths
+        # (pre-joined for target colleges)
+        admission_urls = college.get('admission_urls') or [urljoin(base_url, p) for p in college.get('admission_paths', [])]
+        placement_urls = college.get('placement_urls') or [urljoin(base_url, p) for p in college.get('placement_paths', [])]
+        
+        self._enqueue(base_url, "general", 0)
+        for url in admission_urls:
+            self._enqueue(url, "admission", 0)
+        for url in placement_urls:
+            self._enqueue(url, "placement", 0)
+        
+        # Process the URL queue with a pool of workers
+        async def worker():
+            while True:
+                url, page_type, depth = await self.url_queue.get()
+                try:
+                    if self.pages_visited < MAX_PAGES_PER_COLLEGE:
+                        await self.process_url(url, college_name, domain, page_type=page_type, depth=depth)
+                except Exception as e:
+                    logger.error(f"Error processing {url}: {e}")
+                finally:
+                    self.url_queue.task_done()
         
-        # Process specific admission and placement paths
-        for path in college.get('admission_paths', []):
-            url = urljoin(base_url, path)
-            if url not in self.queued_urls:
-                self.queued_urls.add(url)
-                await self.process_url(url, college_name, domain, page_type="admission", depth=0)
-                
-        for path in college.get('placement_paths', []):
-            url = urljoin(base_url, path)
-            if url not in self.queued_urls:
-                self.queued_urls.add(url)
-                await self.process_url(url, college_name, domain, page_type="placement", depth=0)
-        
-        # Process the URL queue
-        while self.queued_urls and len(self.visited_urls) < MAX_PAGES_PER_COLLEGE:
-            url = self.queued_urls.pop()
-            if url not in self.visited_urls:
-                await self.process_url(url, college_name, domain, depth=1)
+        workers = [asyncio.create_task(worker()) for _ in range(CRAWL_CONCURRENCY)]
+        try:
+            await self.url_queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self._close_retired_browsers()
+            await self._flush_raw_data()
                 
-        logger.info(f"Finished crawling: {college['name']} - Visited {len(self.visited_urls)} pages")
+        logger.info(f"Finished crawling: {college['name']} - Visited {self.pages_visited} pages")
     
     async def process_url(
         self, 
@@ -123,138 +298,237 @@ class CollegeCrawler:
             depth: Current depth in crawl
         """
         # Skip if we've already visited or if we've reached max pages
-        if url in self.visited_urls or len(self.visited_urls) >= MAX_PAGES_PER_COLLEGE:
+        fingerprint = url_fingerprint(url)
+        if fingerprint in self.visited_urls or self.pages_visited >= MAX_PAGES_PER_COLLEGE:
             return
             
         # Mark as visited
-        self.visited_urls.add(url)
+        self.visited_urls.add(fingerprint)
+        self.pages_visited += 1
         
         logger.info(f"Processing URL: {url} (type: {page_type}, depth: {depth})")
         
-        # Determine if we should use browser or direct requests
-        page_data = None
-        if self.use_browser and self.browser_manager:
-            page_data = await self.browser_manager.navigate(url)
-        else:
-            page_data = self._fetch_with_requests(url)
+        # Fetch the page with the active browser backend
+        if not self.browser_manager:
+            await self.init_browser()
+        page_data = await self._fetch_page(url)
+        
+        # Static fetch returned a JavaScript shell - render it in the browser instead
+        if (self.use_browser and isinstance(self.browser_manager, SimpleBrowser)
+                and page_data and page_data['success'] and needs_javascript(page_data['content'])):
+            async with self._page_lock:
+                if isinstance(self.browser_manager, SimpleBrowser):
+                    logger.info(f"{url} needs JavaScript, switching to the browser")
+                    # Other workers may still be fetching with it - close it after the crawl
+                    self._retired_browsers.append(self.browser_manager)
+                    self.browser_manager = BrowserManager(use_proxies=self.use_proxies)
+                    await self._assign_proxy(self.browser_manager)
+                    await self.browser_manager.init_browser()
+            page_data = await self._fetch_page(url)
         
         if not page_data or not page_data['success']:
             logger.warning(f"Failed to fetch {url}")
             return
             
-        # Analyze content to determine page type if not provided
-        if not page_type:
-            page_type = self._determine_page_type(page_data['content'])
-        
-        # Store raw data in MongoDB
-        raw_data = {
-            "college_name": college_name,
-            "url": url,
-            "page_type": page_type,
-            "content_type": "text/html",
-            "raw_content": self._extract_main_content(page_data['content']),
-            "raw_html": page_data['content'],
-            "extraction_date": datetime.now(),
-            "metadata": {
-                "http_status": page_data['status'],
-                "crawler_session": self._generate_session_id(),
-                "depth": depth
+        # Parse once and share the tree between the helpers below; the CPU-bound
+        # helpers run in the thread pool, one at a time per page
+        loop = asyncio.get_running_loop()
+        tree = await loop.run_in_executor(self._cpu_pool, LexborHTMLParser, page_data['content'])
+        main_content = await loop.run_in_executor(self._cpu_pool, self._extract_main_content, tree)
+        
+        # Same text as a page we already stored (mirror, query-string variant):
+        # record the alias and skip classification and embedded content
+        raw_id = ObjectId()
+        fingerprint = hash64(" ".join(main_content.split()).encode("utf-8")) if main_content else None
+        duplicate = self.content_index.get(fingerprint) if fingerprint is not None else None
+        
+        if duplicate:
+            original_id, original_type = duplicate
+            await self._queue_raw_data({
+                "_id": raw_id,
+                "college_name": college_name,
+                "url": url,
+                "page_type": page_type or original_type or "general",
+                "content_type": "text/html",
+                "raw_content": "",
+                "raw_html": "",
+                "extraction_date": datetime.now(),
+                "metadata": {
+                    "http_status": page_data['status'],
+                    "crawler_session": self._generate_session_id(),
+                    "depth": depth,
+                    "duplicate_of": original_id
+                }
+            })
+            logger.debug(f"{url} duplicates {original_id}, skipping processing")
+        else:
+            # Claim the fingerprint before any await so concurrent copies see it
+            if fingerprint is not None:
+                self.content_index[fingerprint] = (str(raw_id), page_type)
+            
+            # Analyze content to determine page type if not provided
+            if not page_type:
+                classification = await self.ai_processor.classify_content_async(page_data['content'])
+                page_type = await loop.run_in_executor(
+                    self._cpu_pool, self._determine_page_type, tree, classification
+                )
+                if fingerprint is not None:
+                    self.content_index[fingerprint] = (str(raw_id), page_type)
+            
+            # Store raw data in MongoDB
+            raw_data = {
+                "_id": raw_id,
+                "college_name": college_name,
+                "url": url,
+                "page_type": page_type,
+                "content_type": "text/html",
+                "raw_content": main_content,
+                "raw_html": page_data['content'],
+                "extraction_date": datetime.now(),
+                "metadata": {
+                    "http_status": page_data['status'],
+                    "crawler_session": self._generate_session_id(),
+                    "depth": depth
+                }
             }
-        }
-        
-        raw_id = self.db.insert_raw_data(raw_data)
-        logger.debug(f"Saved raw data with ID: {raw_id}")
-        
-        # Extract and process any embedded data
-        await self._process_embedded_content(page_data['content'], url, college_name, raw_id)
+            
+            # Keep backend JSON the page loaded - structured data beats scraped HTML
+            if page_data.get('api_json'):
+                raw_data["api_json"] = page_data['api_json']
+            
+            raw_id = await self._queue_raw_data(raw_data)
+            logger.debug(f"Saved raw data with ID: {raw_id}")
+            
+            # Extract and process any embedded data
+            await self._process_embedded_content(tree, url, college_name, raw_id)
         
         # If we haven't reached max depth, extract and queue links
         if depth < MAX_DEPTH:
-            links = self._extract_links(page_data['content'], url)
+            links = await loop.run_in_executor(self._cpu_pool, self._extract_links, tree, url)
             
             # Filter links
-            filtered_links = self._filter_links(links, domain, page_type)
+            filtered_links = await loop.run_in_executor(
+                self._cpu_pool, self._filter_links, links, domain
+            )
             
             # Queue filtered links
             for link, link_type in filtered_links:
-                if link not in self.visited_urls and link not in self.queued_urls:
-                    self.queued_urls.add(link)
-                    # If the link type is specific (admission/placement), use it
-                    processed_type = link_type if link_type in ("admission", "placement") else page_type
-                    logger.debug(f"Queued: {link} (type: {processed_type})")
+                if url_fingerprint(link) not in self.visited_urls:
+                    # Keep the type only when the link's own URL marks it as
+                    # admission/placement; otherwise detect it when the page is processed
+                    self._enqueue(link, link_type, depth + 1)
+                    logger.debug(f"Queued: {link} (type: {link_type or 'to be detected'})")
     
-    def _fetch_with_requests(self, url: str) -> Dict[str, Any]:
+    def _enqueue(self, url: str, page_type: Optional[str], depth: int) -> None:
         """
-        Fetch a URL using requests library
+        Queue a URL for the crawl workers unless it was already queued
         
         Args:
-            url: URL to fetch
+            url: URL to process
+            page_type: Known page type, or None to detect it
+            depth: Crawl depth of the URL
+        """
+        fingerprint = url_fingerprint(url)
+        if fingerprint in self.queued_urls:
+            return
+        self.queued_urls.add(fingerprint)
+        if self.url_queue is not None:
+            self.url_queue.put_nowait((url, page_type, depth))
+    
+    async def _queue_raw_data(self, doc: Dict[str, Any]) -> str:
+        """
+        Queue a raw document for the next batch insert
+        
+        Args:
+            doc: Raw data document
             
         Returns:
-            Dict with page data
+            ID the document will be stored under
         """
-        result = {
-            'success': False,
-            'url': url,
-            'content': '',
-            'status': 0
-        }
+        # Assign the ID up front so child documents can reference their parent
+        doc.setdefault('_id', ObjectId())
+        self._pending_docs.append(doc)
         
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Cache-Control': 'max-age=0'
-            }
+        if len(self._pending_docs) >= RAW_DATA_BATCH_SIZE:
+            await self._flush_raw_data()
             
-            response = requests.get(url, headers=headers, timeout=15)
-            result['status'] = response.status_code
-            result['url'] = response.url
+        return str(doc['_id'])
+    
+    async def _flush_raw_data(self) -> None:
+        """
+        Insert all queued raw documents with a single insert_many
+        
+        BSON encoding of the large HTML bodies and the round trip to MongoDB
+        run in a worker thread, so the event loop keeps serving fetches.
+        """
+        if not self._pending_docs:
+            return
             
-            if response.status_code == 200:
-                result['content'] = response.text
-                result['success'] = True
-                
-            return result
+        docs, self._pending_docs = self._pending_docs, []
+        try:
+            await asyncio.to_thread(self.db.insert_raw_data_batch, docs)
+            logger.debug(f"Saved batch of {len(docs)} raw documents")
         except Exception as e:
-            logger.error(f"Error fetching {url} with requests: {e}")
-            return result
+            logger.error(f"Error saving batch of {len(docs)} raw documents: {e}")
+    
+    async def _fetch_page(self, url: str) -> Dict[str, Any]:
+        """
+        Navigate to a URL with the active backend
+        
+        Plain HTTP fetches run concurrently; Playwright navigations share one
+        page and are serialized, together with reading the JSON they captured.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            Page info dict from the backend
+        """
+        if isinstance(self.browser_manager, BrowserManager):
+            async with self._page_lock:
+                page_data = await self.browser_manager.navigate(url)
+                page_data['api_json'] = self.browser_manager.get_captured_json()
+                return page_data
+        return await self.browser_manager.navigate(url)
+    
+    async def _close_retired_browsers(self) -> None:
+        """Close backends that were replaced during the crawl"""
+        for browser in self._retired_browsers:
+            await browser.close()
+        self._retired_browsers = []
     
-    def _determine_page_type(self, content: str) -> str:
+    def _determine_page_type(self, tree: LexborHTMLParser, classification: Optional[Dict[str, Any]] = None) -> str:
         """
         Determine the type of page based on content
         
         Args:
-            content: HTML content of the page
+            tree: Parsed HTML of the page
+            classification: AI classification already fetched for the page (requested if None)
             
         Returns:
             Page type ('admission', 'placement', or 'general')
         """
         # Use AI processor for more accurate classification
         try:
-            classification = self.ai_processor.classify_content(content)
+            if classification is None:
+                classification = self.ai_processor.classify_content(tree.html)
             if classification and classification.get('confidence', 0) > 0.6:
                 return classification['class']
         except Exception as e:
             logger.warning(f"AI classification failed: {e}")
         
         # Fallback to keyword matching
-        soup = BeautifulSoup(content, 'html.parser')
-        text = soup.get_text().lower()
+        text = tree.text().lower()
         
-        # Check for specific page indicators
-        admission_indicators = [ind.lower() for ind in PAGE_CONTENT_INDICATORS['admission']]
-        placement_indicators = [ind.lower() for ind in PAGE_CONTENT_INDICATORS['placement']]
+        found = _find_page_type_terms(text)
         
-        admission_count = sum(1 for ind in admission_indicators if ind in text)
-        placement_count = sum(1 for ind in placement_indicators if ind in text)
+        # Check for specific page indicators
+        admission_count = len(found & _PAGE_TYPE_TERMS['admission_indicators'])
+        placement_count = len(found & _PAGE_TYPE_TERMS['placement_indicators'])
         
         # Count keyword occurrences
-        admission_keyword_count = sum(1 for keyword in ADMISSION_KEYWORDS if keyword.lower() in text)
-        placement_keyword_count = sum(1 for keyword in PLACEMENT_KEYWORDS if keyword.lower() in text)
+        admission_keyword_count = len(found & _PAGE_TYPE_TERMS['admission_keywords'])
+        placement_keyword_count = len(found & _PAGE_TYPE_TERMS['placement_keywords'])
         
         # Determine type based on frequency
         if admission_count > placement_count or admission_keyword_count > placement_keyword_count:
@@ -264,65 +538,57 @@ class CollegeCrawler:
         else:
             return "general"
     
-    def _extract_main_content(self, html: str) -> str:
+    def _extract_main_content(self, tree: LexborHTMLParser) -> str:
         """
         Extract the main content text from HTML
         
         Args:
-            html: HTML content
+            tree: Parsed HTML (left unmodified)
             
         Returns:
             Extracted main content text
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            # Work on a copy - stripping tags would change the shared tree
+            tree = tree.clone()
             
             # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.extract()
+            tree.strip_tags(["script", "style", "nav", "footer", "header"])
             
             # Try to find main content area
             main_content = None
             
-            # Try common content containers
-            content_selectors = [
-                "main", "article", "#content", ".content", "#main-content", 
-                ".main-content", "#main", ".main", ".page-content", "#page-content"
-            ]
-            
-            for selector in content_selectors:
-                content = soup.select(selector)
-                if content:
-                    main_content = content[0]
+            # Try common content containers: one walk collects every candidate,
+            # then the most specific selector picks among them
+            candidates = tree.css(_CONTENT_SELECTOR)
+            for selector in _CONTENT_SELECTORS:
+                main_content = next((node for node in candidates if node.css_matches(selector)), None)
+                if main_content:
                     break
             
             # If no main content found, use body
             if not main_content:
-                main_content = soup.body
+                main_content = tree.body
             
             if not main_content:
-                return soup.get_text(separator='\n', strip=True)
+                return node_text_lines(tree)
             
             # Get text with better formatting
-            paragraphs = main_content.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li'])
-            content_text = "\n".join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+            paragraphs = main_content.css(_TEXT_BLOCK_SELECTOR)
+            texts = (p.text(strip=True) for p in paragraphs)
+            content_text = "\n".join(text for text in texts if text)
             
             if not content_text:
-                content_text = main_content.get_text(separator='\n', strip=True)
+                content_text = node_text_lines(main_content)
             
             return content_text
         except Exception as e:
             logger.error(f"Error extracting main content: {e}")
-            # Fallback to simple text extraction
-            try:
-                soup = BeautifulSoup(html, 'html.parser')
-                return soup.get_text(separator='\n', strip=True)
-            except:
-                return ""
+            return ""
     
     async def _process_embedded_content(
         self, 
-        html: str, 
+        tree: LexborHTMLParser, 
         base_url: str, 
         college_name: str, 
         parent_id: str
@@ -331,19 +597,17 @@ class CollegeCrawler:
         Extract and process embedded content like tables, images, PDFs
         
         Args:
-            html: HTML content
+            tree: Parsed HTML of the page
             base_url: Base URL for resolving relative links
             college_name: Name of the college
             parent_id: ID of the parent raw data document
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # Process tables
-        tables = soup.find_all('table')
+        tables = tree.css('table')
         for i, table in enumerate(tables):
             try:
                 # Convert table to HTML string
-                table_html = str(table)
+                table_html = table.html
                 
                 # Save table as raw data
                 table_data = {
@@ -351,7 +615,7 @@ class CollegeCrawler:
                     "url": base_url,
                     "page_type": "table",
                     "content_type": "text/html",
-                    "raw_content": table.get_text(separator='\n', strip=True),
+                    "raw_content": node_text_lines(table),
                     "raw_html": table_html,
                     "extraction_date": datetime.now(),
                     "metadata": {
@@ -361,7 +625,7 @@ class CollegeCrawler:
                     }
                 }
                 
-                table_id = self.db.insert_raw_data(table_data)
+                table_id = await self._queue_raw_data(table_data)
                 logger.debug(f"Saved table with ID: {table_id}")
                 
                 # Process table with AI
@@ -373,15 +637,18 @@ class CollegeCrawler:
         # Process images that might contain charts or data
         data_images = []
         
-        # Look for images in specific contexts that suggest they contain data
-        chart_indicators = ['chart', 'graph', 'data', 'statistics', 'placement', 'admission']
+        # Whether a node's text mentions a chart indicator, by node - images
+        # sharing a container only read its text once
+        context_cache = {}
         
         # Find image tags
-        for img in soup.find_all('img'):
+        for img in tree.css('img'):
+            attrs = img.attributes
+            
             # Skip small icons and logos
-            if img.get('width') and int(img.get('width')) < 200:
+            if attrs.get('width') and int(attrs.get('width')) < 200:
                 continue
-            if img.get('height') and int(img.get('height')) < 200:
+            if attrs.get('height') and int(attrs.get('height')) < 200:
                 continue
                 
             # Check if the image is likely a chart or data image
@@ -389,183 +656,238 @@ class CollegeCrawler:
             
             # Check image alt, title, or class
             for attr in ['alt', 'title', 'class']:
-                if img.get(attr):
-                    for indicator in chart_indicators:
-                        if indicator.lower() in img.get(attr).lower():
-                            is_data_image = True
-                            break
+                value = attrs.get(attr)
+                if value and any(indicator in value.lower() for indicator in _CHART_INDICATORS):
+                    is_data_image = True
+                    break
             
             # Check parent elements for context
             parent = img.parent
             for _ in range(3):  # Check up to 3 levels up
-                if parent and parent.name:
-                    parent_text = parent.get_text().lower()
-                    for indicator in chart_indicators:
-                        if indicator in parent_text:
-                            is_data_image = True
-                            break
-                    
-                    # Move up to the next parent
-                    parent = parent.parent
-                else:
+                if is_data_image or not (parent and parent.tag):
                     break
+                
+                mentions = context_cache.get(parent.mem_id)
+                if mentions is None:
+                    parent_text = parent.text().lower()
+                    mentions = any(indicator in parent_text for indicator in _CHART_INDICATORS)
+                    context_cache[parent.mem_id] = mentions
+                is_data_image = mentions
+                
+                # Move up to the next parent
+                parent = parent.parent
             
             if is_data_image:
-                src = img.get('src')
+                src = attrs.get('src')
                 if src:
                     # Resolve relative URLs
-                    full_url = urljoin(base_url, src)
+                    full_url = fast_urljoin(base_url, src)
                     data_images.append(full_url)
         
-        # Process each data image
-        for img_url in data_images:
-            try:
-                # Download the image
-                img_content = await self._download_file(img_url)
-                if not img_content:
-                    continue
-                
-                # Store image raw data
-                img_data = {
-                    "college_name": college_name,
-                    "url": img_url,
-                    "page_type": "image",
-                    "content_type": "image",
-                    "raw_content": "",
-                    "raw_html": "",
-                    "extraction_date": datetime.now(),
-                    "metadata": {
-                        "parent_id": parent_id,
-                        "content_length": len(img_content),
-                        "crawler_session": self._generate_session_id()
-                    }
-                }
-                
-                img_id = self.db.insert_raw_data(img_data)
-                logger.debug(f"Saved image with ID: {img_id}")
-                
-                # Save image to disk
-                img_path = os.path.join(self.downloads_dir, f"{img_id}.jpg")
-                with open(img_path, 'wb') as f:
-                    f.write(img_content)
-                
-                # Process image with AI
-                await self.ai_processor.process_image(img_path, img_id, college_name)
-                
-            except Exception as e:
-                logger.error(f"Error processing image {img_url}: {e}")
-        
-        # Process linked files (PDFs, etc.)
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
+        # Collect linked files (PDFs, etc.), each URL once
+        file_links = {}
+        for link in tree.css('a[href]'):
+            href = link.attrs.get('href')
             if not href:
                 continue
                 
             # Resolve relative URL
-            full_url = urljoin(base_url, href)
+            full_url = fast_urljoin(base_url, href)
             
             # Check if it's a file we want to download
-            file_ext = os.path.splitext(full_url.lower())[1].lstrip('.')
-            if file_ext in ALLOWED_FILE_TYPES:
-                try:
-                    # Download the file
-                    file_content = await self._download_file(full_url)
-                    if not file_content:
-                        continue
-                    
-                    # Determine content type
-                    content_type = "application/octet-stream"
-                    if file_ext == "pdf":
-                        content_type = "application/pdf"
-                    elif file_ext in ["doc", "docx"]:
-                        content_type = "application/msword"
-                    elif file_ext in ["xls", "xlsx"]:
-                        content_type = "application/vnd.ms-excel"
-                    elif file_ext in ["jpg", "jpeg", "png", "gif"]:
-                        content_type = f"image/{file_ext}"
-                        
-                    # Store file metadata in MongoDB
-                    file_data = {
-                        "college_name": college_name,
-                        "url": full_url,
-                        "page_type": file_ext,
-                        "content_type": content_type,
-                        "raw_content": "",
-                        "raw_html": "",
-                        "extraction_date": datetime.now(),
-                        "metadata": {
-                            "parent_id": parent_id,
-                            "content_length": len(file_content),
-                            "file_extension": file_ext,
-                            "crawler_session": self._generate_session_id()
-                        }
-                    }
-                    
-                    file_id = self.db.insert_raw_data(file_data)
-                    logger.debug(f"Saved file {full_url} with ID: {file_id}")
-                    
-                    # Save file to disk
-                    file_path = os.path.join(self.downloads_dir, f"{file_id}.{file_ext}")
-                    with open(file_path, 'wb') as f:
-                        f.write(file_content)
-                    
-                    # Process file with appropriate AI processor
-                    if file_ext == "pdf":
-                        await self.ai_processor.process_pdf(file_path, file_id, college_name)
-                    elif file_ext in ["jpg", "jpeg", "png", "gif"]:
-                        await self.ai_processor.process_image(file_path, file_id, college_name)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing file {full_url}: {e}")
+            lowered = full_url.lower()
+            if lowered.endswith(_FILE_SUFFIXES):
+                file_links.setdefault(full_url, lowered.rsplit('.', 1)[1])
+        
+        # Download every image and file at once, straight to their final names
+        image_links = [(url, "jpg") for url in dict.fromkeys(data_images)]
+        downloads = image_links + list(file_links.items())
+        results = await asyncio.gather(
+            *[self._download_embedded(url, ext) for url, ext in downloads],
+            return_exceptions=True
+        )
+        
+        for i, ((url, ext), result) in enumerate(zip(downloads, results)):
+            if isinstance(result, Exception):
+                logger.error(f"Error downloading {url}: {result}")
+                continue
+            if not result:
+                continue
+                
+            doc_id, path = result
+            is_image = i < len(image_links)
+            try:
+                if is_image:
+                    await self._save_data_image(url, doc_id, path, college_name, parent_id)
+                else:
+                    await self._save_linked_file(url, ext, doc_id, path, college_name, parent_id)
+            except Exception as e:
+                logger.error(f"Error processing {'image' if is_image else 'file'} {url}: {e}")
     
-    async def _download_file(self, url: str) -> Optional[bytes]:
+    async def _download_embedded(self, url: str, ext: str) -> Optional[Tuple[ObjectId, str]]:
         """
-        Download a file from a URL
+        Download an embedded image or file under a freshly allocated document ID
+        
+        Args:
+            url: URL of the image or file
+            ext: Extension used for the saved file
+            
+        Returns:
+            Tuple (document ID, file path) or None if the download failed
+        """
+        doc_id = ObjectId()
+        path = os.path.join(self.downloads_dir, f"{doc_id}.{ext}")
+        
+        async with self._download_semaphore:
+            if not await self._download_file(url, path):
+                return None
+        return doc_id, path
+    
+    async def _save_data_image(
+        self, 
+        img_url: str, 
+        img_id: ObjectId, 
+        img_path: str, 
+        college_name: str, 
+        parent_id: str
+    ) -> None:
+        """
+        Store a downloaded data image and send it for AI processing
+        
+        Args:
+            img_url: URL of the image
+            img_id: Document ID allocated for the image
+            img_path: Path of the downloaded image
+            college_name: Name of the college
+            parent_id: ID of the parent raw data document
+        """
+        # Store image raw data
+        img_data = {
+            "_id": img_id,
+            "college_name": college_name,
+            "url": img_url,
+            "page_type": "image",
+            "content_type": "image",
+            "raw_content": "",
+            "raw_html": "",
+            "extraction_date": datetime.now(),
+            "metadata": {
+                "parent_id": parent_id,
+                "content_length": os.path.getsize(img_path),
+                "crawler_session": self._generate_session_id()
+            }
+        }
+        
+        img_id = await self._queue_raw_data(img_data)
+        logger.debug(f"Saved image with ID: {img_id}")
+        
+        # Process image with AI
+        await self.ai_processor.process_image(img_path, img_id, college_name)
+    
+    async def _save_linked_file(
+        self, 
+        file_url: str, 
+        file_ext: str, 
+        file_id: ObjectId, 
+        file_path: str, 
+        college_name: str, 
+        parent_id: str
+    ) -> None:
+        """
+        Store a downloaded linked file and send it for AI processing
+        
+        Args:
+            file_url: URL of the file
+            file_ext: File extension
+            file_id: Document ID allocated for the file
+            file_path: Path of the downloaded file
+            college_name: Name of the college
+            parent_id: ID of the parent raw data document
+        """
+        # Determine content type
+        content_type = "application/octet-stream"
+        if file_ext == "pdf":
+            content_type = "application/pdf"
+        elif file_ext in ["doc", "docx"]:
+            content_type = "application/msword"
+        elif file_ext in ["xls", "xlsx"]:
+            content_type = "application/vnd.ms-excel"
+        elif file_ext in ["jpg", "jpeg", "png", "gif"]:
+            content_type = f"image/{file_ext}"
+            
+        # Store file metadata in MongoDB
+        file_data = {
+            "_id": file_id,
+            "college_name": college_name,
+            "url": file_url,
+            "page_type": file_ext,
+            "content_type": content_type,
+            "raw_content": "",
+            "raw_html": "",
+            "extraction_date": datetime.now(),
+            "metadata": {
+                "parent_id": parent_id,
+                "content_length": os.path.getsize(file_path),
+                "file_extension": file_ext,
+                "crawler_session": self._generate_session_id()
+            }
+        }
+        
+        file_id = await self._queue_raw_data(file_data)
+        logger.debug(f"Saved file {file_url} with ID: {file_id}")
+        
+        # Process file with appropriate AI processor
+        if file_ext == "pdf":
+            await self.ai_processor.process_pdf(file_path, file_id, college_name)
+        elif file_ext in ["jpg", "jpeg", "png", "gif"]:
+            await self.ai_processor.process_image(file_path, file_id, college_name)
+    
+    async def _download_file(self, url: str, dest_path: Optional[str] = None) -> Optional[str]:
+        """
+        Stream a file from a URL to disk
         
         Args:
             url: URL of the file to download
+            dest_path: Where to save the file (temporary file in downloads dir if None)
             
         Returns:
-            File content as bytes or None if download failed
+            Path of the downloaded file or None if download failed
         """
         try:
-            if self.use_browser and self.browser_manager:
-                return await self.browser_manager.download_file(url)
-            else:
-                response = requests.get(url, timeout=15, stream=True)
-                if response.status_code == 200:
-                    return response.content
-                return None
+            if not self.browser_manager:
+                await self.init_browser()
+            return await self.browser_manager.download_file(url, dest_path)
         except Exception as e:
             logger.error(f"Error downloading file {url}: {e}")
             return None
     
-    def _extract_links(self, html: str, base_url: str) -> List[str]:
+    def _extract_links(self, tree: LexborHTMLParser, base_url: str) -> List[str]:
         """
         Extract links from HTML content
         
         Args:
-            html: HTML content
+            tree: Parsed HTML of the page
             base_url: Base URL for resolving relative links
             
         Returns:
             List of extracted URLs
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
             links = []
             
-            for a_tag in soup.find_all('a', href=True):
-                href = a_tag.get('href')
+            # Reuse the page's tree; attrs.get reads only the href instead of
+            # building every attribute into a dict
+            for a_tag in tree.css('a[href]'):
+                href = a_tag.attrs.get('href')
                 if not href:
                     continue
                     
                 # Skip JavaScript links and anchors
-                if href.startswith('javascript:') or href.startswith('#'):
+                if href.startswith(('javascript:', '#')):
                     continue
                     
                 # Resolve relative URL
-                full_url = urljoin(base_url, href)
+                full_url = fast_urljoin(base_url, href)
                 
                 # Skip mail links
                 if full_url.startswith('mailto:'):
@@ -581,19 +903,18 @@ class CollegeCrawler:
     def _filter_links(
         self, 
         links: List[str], 
-        domain: str, 
-        current_page_type: str
-    ) -> List[Tuple[str, str]]:
+        domain: str
+    ) -> List[Tuple[str, Optional[str]]]:
         """
         Filter and categorize links
         
         Args:
             links: List of URLs to filter
             domain: Domain for restricting crawl
-            current_page_type: Type of the current page
             
         Returns:
-            List of tuples (URL, page_type)
+            List of tuples (URL, page_type), page_type None when the URL
+            does not mark the link as admission or placement
         """
         filtered_links = []
         
@@ -610,39 +931,33 @@ class CollegeCrawler:
                 continue
                 
             # Skip common file types we don't want to crawl (but will download separately)
-            skip_extensions = ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.jpg', '.jpeg', '.png', '.gif']
-            if any(parsed.path.lower().endswith(ext) for ext in skip_extensions):
+            if parsed.path.lower().endswith(_SKIP_EXTENSIONS):
                 continue
             
-            # Determine page type based on URL patterns
-            page_type = current_page_type
-            
-            # Check admission patterns
-            for pattern in CUSTOM_URL_PATTERNS['admission_patterns']:
-                if re.search(pattern, parsed.path.lower()):
-                    page_type = "admission"
-                    break
-                    
-            # Check placement patterns
-            for pattern in CUSTOM_URL_PATTERNS['placement_patterns']:
-                if re.search(pattern, parsed.path.lower()):
-                    page_type = "placement"
-                    break
+            # Determine page type based on URL patterns (placement wins over admission)
+            page_type = classify_url_path(parsed.path)
             
             filtered_links.append((url, page_type))
             
         return filtered_links
     
     def _generate_session_id(self) -> str:
-        """Generate a unique session ID for tracking crawl sessions"""
-        return hashlib.md5(f"{time.time()}".encode()).hexdigest()
+        """Get the session ID for tracking crawl sessions (computed once per crawler)"""
+        return self._session_id
     
     async def close(self) -> None:
         """Close resources"""
         if self.browser_manager:
             await self.browser_manager.close()
+        await self._close_retired_browsers()
         
         if self.db:
+            await self._flush_raw_data()
             self.db.close()
+        
+        if self.proxy_manager:
+            self.proxy_manager.close()
+        
+        self._cpu_pool.shutdown(wait=False)
             
         logger.info("Crawler resources closed")
\ No newline at end of file
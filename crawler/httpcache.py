@@ -0,0 +1,161 @@
+"""
+Persistent HTTP response cache with conditional-GET revalidation
+"""
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from config.settings import HTTP_CACHE_EXPIRE_AFTER, HTTP_CACHE_MEMORY_ITEMS
+
+logger = logging.getLogger(__name__)
+
+class HTTPCache:
+    """
+    SQLite-backed page cache with an in-memory LRU in front
+    
+    Safe to call from worker threads (e.g. through asyncio.to_thread).
+    """
+    
+    def __init__(self, path: str, expire_after: int = HTTP_CACHE_EXPIRE_AFTER,
+                 memory_items: int = HTTP_CACHE_MEMORY_ITEMS):
+        """
+        Initialize the cache
+        
+        Args:
+            path: SQLite database file
+            expire_after: Seconds an entry is served without revalidation
+            memory_items: Number of entries kept in memory
+        """
+        self.expire_after = expire_after
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, final_url TEXT, content TEXT, "
+            "etag TEXT, last_modified TEXT, stored_at REAL)"
+        )
+        self.conn.commit()
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+        
+        Args:
+            url: Requested URL
+        
+        Returns:
+            Entry dict or None if the URL is not cached
+        """
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                self._memory.move_to_end(url)
+                return entry
+            
+            row = self.conn.execute(
+                "SELECT final_url, content, etag, last_modified, stored_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            entry = dict(zip(('final_url', 'content', 'etag', 'last_modified', 'stored_at'), row))
+            self._remember(url, entry)
+            return entry
+    
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """
+        Check whether an entry can be served without revalidation
+        
+        Args:
+            entry: Entry returned by get()
+        
+        Returns:
+            True if the entry is younger than expire_after
+        """
+        return time.time() - entry['stored_at'] < self.expire_after
+    
+    def validators(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Build conditional request headers for an entry
+        
+        Args:
+            entry: Entry returned by get()
+        
+        Returns:
+            Dict with If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def put(self, url: str, final_url: str, content: str,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Store a response
+        
+        Args:
+            url: Requested URL
+            final_url: URL after redirects
+            content: Decoded page content
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        """
+        entry = {
+            'final_url': final_url,
+            'content': content,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time()
+        }
+        with self._lock:
+            try:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, final_url, content, etag, last_modified, entry['stored_at'])
+                )
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not cache response for {url}: {e}")
+            self._remember(url, entry)
+    
+    def touch(self, url: str, entry: Dict[str, Any]) -> None:
+        """
+        Mark an entry as just revalidated (after a 304 Not Modified)
+        
+        Args:
+            url: Requested URL
+            entry: Entry returned by get()
+        """
+        entry['stored_at'] = time.time()
+        with self._lock:
+            try:
+                self.conn.execute("UPDATE responses SET stored_at = ? WHERE url = ?", (entry['stored_at'], url))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not refresh cache entry for {url}: {e}")
+    
+    def _remember(self, url: str, entry: Dict[str, Any]) -> None:
+        """Add an entry to the in-memory LRU, evicting the oldest if full"""
+        self._memory[url] = entry
+        self._memory.move_to_end(url)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self.conn.close()
@@ -1,49 +1,139 @@
 """
 Proxy rotation for avoiding IP blocking
 """
+import os
+import json
+import time
 import logging
 import random
+import socket
+import itertools
+import threading
 import requests
-from typing import Dict, List, Any, Optional
-from config.settings import PROXY_ROTATION_FREQUENCY
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree, html as lxml_html
+from typing import List, Any, Optional, NamedTuple
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from config.settings import (
+    PROXY_ROTATION_FREQUENCY,
+    PROXY_VERIFY_LIMIT,
+    MIN_PROXIES,
+    PROXY_CONNECT_TIMEOUT,
+    PROXY_CACHE_PATH,
+    PROXY_CACHE_TTL,
+    DOWNLOAD_CHUNK_SIZE
+)
 
 logger = logging.getLogger(__name__)
 
+# The proxy list pages are parsed with lxml only: it is as fast as selectolax
+# here and, unlike selectolax, can parse the proxynova page while it streams.
+# XPath expressions for the proxy list pages, compiled once
+_TABLE_ROWS_XPATH = etree.XPath('//table//tr[td]')
+_DATA_IP_XPATH = etree.XPath('.//*[@data-ip]')
+
+def _json_loads(data: bytes) -> Any:
+    """
+    Parse JSON straight from bytes
+    
+    Args:
+        data: Raw JSON document
+        
+    Returns:
+        Parsed value (orjson if installed, else the json module)
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class Proxy(NamedTuple):
+    """A proxy server; read-only once fetched"""
+    ip: str
+    port: str
+    protocol: str
+    url: str
+    
+    @classmethod
+    def build(cls, ip: str, port: Any, protocol: str) -> "Proxy":
+        """
+        Create a proxy, building its URL once
+        
+        Args:
+            ip: Proxy host
+            port: Proxy port
+            protocol: 'http' or 'https'
+            
+        Returns:
+            Proxy tuple
+        """
+        port = str(port)
+        return cls(ip, port, protocol, f"{protocol}://{ip}:{port}")
+
 class ProxyManager:
     """Manage proxy rotation for crawler"""
     
     def __init__(self):
         """Initialize the proxy manager"""
         self.proxies = []
+        self._cycle = None
         self.current_proxy = None
         self.request_count = 0
-        self.fetch_proxies()
+        self._load_lock = threading.Lock()
+        
+        # One pooled session for the list sources and the verification checks
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=PROXY_VERIFY_LIMIT, pool_maxsize=PROXY_VERIFY_LIMIT)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # The list is loaded on first use (or by prewarm), not here - fetching
+        # and verifying takes seconds
+    
+    def prewarm(self) -> None:
+        """Start loading the proxy list in a background thread"""
+        threading.Thread(target=self._ensure_proxies, daemon=True).start()
+    
+    def _ensure_proxies(self) -> None:
+        """Load the proxy list unless it is already loaded"""
+        with self._load_lock:
+            if self.proxies:
+                return
+            # A list verified by a recent run is reused instead of refetched
+            if not self._load_cached_proxies():
+                self.fetch_proxies()
     
     def fetch_proxies(self) -> None:
         """
         Fetch a list of free proxies from various sources
         """
         try:
-            # Try multiple free proxy sources
+            # Sources are tried in order and only until enough proxies verify,
+            # so the later list pages are usually never requested
             sources = [
-                self._fetch_from_free_proxy_list(),
-                self._fetch_from_proxy_nova(),
-                self._fetch_from_geonode()
+                self._fetch_from_free_proxy_list,
+                self._fetch_from_proxy_nova,
+                self._fetch_from_geonode
             ]
             
-            # Combine proxies from all sources
-            all_proxies = []
-            for source_proxies in sources:
-                if source_proxies:
-                    all_proxies.extend(source_proxies)
-            
-            if all_proxies:
-                # Filter and verify proxies
-                verified_proxies = self._verify_proxies(all_proxies)
-                if verified_proxies:
-                    self.proxies = verified_proxies
-                    logger.info(f"Loaded {len(self.proxies)} verified proxies")
-                    return
+            verified_proxies = []
+            for fetch_source in sources:
+                candidates = fetch_source()
+                if candidates:
+                    verified_proxies.extend(self._verify_proxies(candidates))
+                if len(verified_proxies) >= MIN_PROXIES:
+                    break
+            
+            if verified_proxies:
+                self._set_proxies(verified_proxies)
+                logger.info(f"Loaded {len(self.proxies)} verified proxies")
+                self._save_cached_proxies()
+                return
                     
             # Fallback: add some hardcoded free proxies if no other sources worked
             self._add_fallback_proxies()
@@ -52,160 +142,246 @@ class ProxyManager:
             logger.error(f"Error fetching proxies: {e}")
             self._add_fallback_proxies()
     
-    def _fetch_from_free_proxy_list(self) -> List[Dict[str, Any]]:
+    def _set_proxies(self, proxies: List[Proxy]) -> None:
+        """
+        Install a new proxy list
+        
+        Args:
+            proxies: List of proxies
+        """
+        self.proxies = proxies
+        self._cycle = itertools.cycle(proxies) if proxies else None
+    
+    def _load_cached_proxies(self) -> bool:
+        """
+        Load the proxy list saved by a recent run
+        
+        Returns:
+            True if a cached list younger than PROXY_CACHE_TTL was loaded
+        """
+        try:
+            if time.time() - os.path.getmtime(PROXY_CACHE_PATH) >= PROXY_CACHE_TTL:
+                return False
+            with open(PROXY_CACHE_PATH, 'rb') as f:
+                proxies = [Proxy(**item) for item in _json_loads(f.read())]
+        except (OSError, ValueError, TypeError):
+            # TypeError: a list saved in an older format
+            return False
+        
+        if not proxies:
+            return False
+        self._set_proxies(proxies)
+        logger.info(f"Loaded {len(self.proxies)} cached proxies")
+        return True
+    
+    def _save_cached_proxies(self) -> None:
+        """Save the verified proxy list for later runs"""
+        try:
+            directory = os.path.dirname(PROXY_CACHE_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(PROXY_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump([proxy._asdict() for proxy in self.proxies], f)
+        except OSError as e:
+            logger.warning(f"Could not cache proxy list: {e}")
+    
+    def _fetch_from_free_proxy_list(self) -> List[Proxy]:
         """Fetch proxies from free-proxy-list.net"""
         try:
-            response = requests.get('https://free-proxy-list.net/', timeout=10)
+            response = self.session.get('https://free-proxy-list.net/', timeout=10)
             if response.status_code != 200:
                 return []
                 
-            # Basic parsing - in production, use BeautifulSoup for better parsing
+            # lxml decodes the raw bytes and walks the table in C
             proxies = []
-            rows = response.text.split('<tr><td>')[1:]
-            for row in rows:
-                try:
-                    parts = row.split('</td><td>')
-                    if len(parts) >= 7:
-                        ip = parts[0]
-                        port = parts[1]
-                        https = 'yes' in parts[6].lower()
-                        protocol = 'https' if https else 'http'
-                        
-                        proxies.append({
-                            'ip': ip,
-                            'port': port,
-                            'protocol': protocol
-                        })
-                except:
+            doc = lxml_html.fromstring(response.content)
+            for row in _TABLE_ROWS_XPATH(doc):
+                parts = [cell.text_content().strip() for cell in row.findall('td')]
+                if len(parts) < 7:
                     continue
                     
+                https = 'yes' in parts[6].lower()
+                proxies.append(Proxy.build(parts[0], parts[1], 'https' if https else 'http'))
+                    
             return proxies
-        except:
+        except (requests.RequestException, etree.LxmlError) as e:
+            logger.warning(f"Could not fetch proxies from free-proxy-list.net: {e}")
             return []
     
-    def _fetch_from_proxy_nova(self) -> List[Dict[str, Any]]:
+    def _fetch_from_proxy_nova(self) -> List[Proxy]:
         """Fetch proxies from proxynova.com"""
         try:
-            response = requests.get('https://www.proxynova.com/proxy-server-list/', timeout=10)
-            if response.status_code != 200:
-                return []
-            
-            # Simplified parsing - in production, use BeautifulSoup
             proxies = []
-            for line in response.text.split('\n'):
-                if 'data-ip=' in line and '<td>' in line:
-                    try:
-                        ip_part = line.split('data-ip=')[1].split('>')[1].split('<')[0].strip()
-                        port_part = line.split('</td>')[1].split('<td>')[1].split('</td>')[0].strip()
-                        
-                        if ip_part and port_part.isdigit():
-                            proxies.append({
-                                'ip': ip_part,
-                                'port': port_part,
-                                'protocol': 'http'
-                            })
-                    except:
-                        continue
+            with self.session.get('https://www.proxynova.com/proxy-server-list/', timeout=10, stream=True) as response:
+                if response.status_code != 200:
+                    return []
+                
+                # Parse rows as the body streams in and drop each one once read,
+                # so neither the whole page nor its tree is held in memory
+                parser = etree.HTMLPullParser(events=('end',), tag='tr')
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    parser.feed(chunk)
+                    for _, row in parser.read_events():
+                        proxy = self._parse_proxy_nova_row(row)
+                        if proxy:
+                            proxies.append(proxy)
+                        row.clear()
+                parser.close()
             
             return proxies
-        except:
+        except (requests.RequestException, etree.LxmlError) as e:
+            logger.warning(f"Could not fetch proxies from proxynova.com: {e}")
             return []
     
-    def _fetch_from_geonode(self) -> List[Dict[str, Any]]:
+    def _parse_proxy_nova_row(self, row: etree._Element) -> Optional[Proxy]:
+        """
+        Read a proxy from a proxynova table row
+        
+        Args:
+            row: Parsed <tr> element
+            
+        Returns:
+            Proxy, or None if the row holds no proxy
+        """
+        # Proxy rows hold an element tagged with data-ip; the port is in the
+        # row's second cell
+        elements = _DATA_IP_XPATH(row)
+        cells = row.findall('td')
+        if not elements or len(cells) < 2:
+            return None
+            
+        ip_part = ''.join(elements[0].itertext()).strip() or elements[0].get('data-ip', '').strip()
+        port_part = ''.join(cells[1].itertext()).strip()
+        if not ip_part or not port_part.isdigit():
+            return None
+            
+        return Proxy.build(ip_part, port_part, 'http')
+    
+    def _fetch_from_geonode(self) -> List[Proxy]:
         """Fetch proxies from geonode.com API"""
         try:
             url = "https://proxylist.geonode.com/api/proxy-list?limit=50&page=1&sort_by=lastChecked&sort_type=desc"
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             if response.status_code != 200:
                 return []
             
-            data = response.json()
+            data = _json_loads(response.content)
             proxies = []
             
-            if 'data' in data:
-                for proxy in data['data']:
-                    try:
-                        proxies.append({
-                            'ip': proxy['ip'],
-                            'port': proxy['port'],
-                            'protocol': proxy['protocols'][0].lower() if proxy['protocols'] else 'http'
-                        })
-                    except:
-                        continue
+            for proxy in data.get('data', []):
+                if 'ip' not in proxy or 'port' not in proxy:
+                    continue
+                    
+                protocols = proxy.get('protocols')
+                proxies.append(Proxy.build(proxy['ip'], proxy['port'], protocols[0].lower() if protocols else 'http'))
             
             return proxies
-        except:
+        except (requests.RequestException, ValueError, AttributeError, TypeError) as e:
+            # ValueError covers malformed JSON; the others an unexpected shape
+            logger.warning(f"Could not fetch proxies from geonode.com: {e}")
             return []
     
-    def _verify_proxies(self, proxy_list: List[Dict[str, Any]], max_verify: int = 20) -> List[Dict[str, Any]]:
+    def _verify_proxies(self, proxy_list: List[Proxy], max_verify: int = PROXY_VERIFY_LIMIT) -> List[Proxy]:
         """
         Verify proxies are working by testing them
         
         Args:
-            proxy_list: List of proxy dictionaries
+            proxy_list: List of candidate proxies
             max_verify: Maximum number of proxies to verify (to avoid long startup times)
             
         Returns:
             List of working proxies
         """
-        working_proxies = []
-        
         # Shuffle and limit to avoid always checking the same proxies
         random.shuffle(proxy_list)
         proxy_list = proxy_list[:max_verify]
+        if not proxy_list:
+            return []
         
-        for proxy in proxy_list:
-            try:
-                proxy_url = f"{proxy['protocol']}://{proxy['ip']}:{proxy['port']}"
-                
-                # Test proxy with a 5-second timeout
-                test_request = requests.get(
-                    'https://httpbin.org/ip',
-                    proxies={'http': proxy_url, 'https': proxy_url},
-                    timeout=5
-                )
-                
-                if test_request.status_code == 200:
-                    working_proxies.append(proxy)
-                    logger.debug(f"Verified working proxy: {proxy_url}")
-            except:
-                # Proxy didn't work, skip it
-                continue
+        # Checks are pure network waits - run them all at once
+        with ThreadPoolExecutor(max_workers=len(proxy_list)) as executor:
+            results = list(executor.map(self._check_proxy, proxy_list))
+        
+        return [proxy for proxy in results if proxy is not None]
+    
+    def _check_proxy(self, proxy: Proxy) -> Optional[Proxy]:
+        """
+        Test a single proxy
+        
+        Args:
+            proxy: Proxy to test
+            
+        Returns:
+            The proxy if it answered, otherwise None
+        """
+        # Dead hosts fail the cheap TCP probe without the HTTPS round trip
+        if not self._tcp_alive(proxy):
+            return None
+            
+        try:
+            # Test proxy with a 5-second timeout
+            test_request = self.session.get(
+                'https://httpbin.org/ip',
+                proxies={'http': proxy.url, 'https': proxy.url},
+                timeout=5
+            )
+            
+            if test_request.status_code == 200:
+                logger.debug(f"Verified working proxy: {proxy.url}")
+                return proxy
+        except (requests.RequestException, ValueError):
+            # Proxy didn't work (ValueError: unparseable proxy address), skip it
+            pass
+        return None
+    
+    def _tcp_alive(self, proxy: Proxy) -> bool:
+        """
+        Check that a proxy accepts TCP connections
         
-        return working_proxies
+        Args:
+            proxy: Proxy to test
+            
+        Returns:
+            True if a connection could be opened within PROXY_CONNECT_TIMEOUT
+        """
+        try:
+            with socket.create_connection((proxy.ip, int(proxy.port)), timeout=PROXY_CONNECT_TIMEOUT):
+                return True
+        except (OSError, ValueError):
+            return False
     
     def _add_fallback_proxies(self) -> None:
         """Add fallback proxies if no other sources work"""
         # Note: These are example proxies and will likely not work in production
         # In a real system, you would use a paid proxy service with an API
         fallback_proxies = [
-            {'ip': '165.225.114.76', 'port': '10605', 'protocol': 'http'},
-            {'ip': '165.225.208.76', 'port': '10605', 'protocol': 'http'},
-            {'ip': '165.225.39.90', 'port': '10605', 'protocol': 'https'},
-            {'ip': '112.245.48.74', 'port': '9002', 'protocol': 'http'},
-            {'ip': '45.77.107.242', 'port': '3128', 'protocol': 'http'}
+            Proxy.build('165.225.114.76', '10605', 'http'),
+            Proxy.build('165.225.208.76', '10605', 'http'),
+            Proxy.build('165.225.39.90', '10605', 'https'),
+            Proxy.build('112.245.48.74', '9002', 'http'),
+            Proxy.build('45.77.107.242', '3128', 'http')
         ]
         
         # Try to verify these fallback proxies
         verified = self._verify_proxies(fallback_proxies)
         
         if verified:
-            self.proxies = verified
+            self._set_proxies(verified)
             logger.info(f"Using {len(verified)} fallback proxies")
         else:
             # Last resort: no proxies available, just add the fallback ones anyway
-            self.proxies = fallback_proxies
+            self._set_proxies(fallback_proxies)
             logger.warning("No working proxies available, using unverified fallback proxies")
     
-    def get_proxy(self) -> Optional[Dict[str, Any]]:
+    def get_proxy(self) -> Optional[Proxy]:
         """
-        Get the next proxy in rotation
+        Get the next proxy in rotation (round-robin)
         
         Returns:
-            Dictionary with proxy information or None if no proxies available
+            Proxy (with ip, port, protocol and url fields) or None if no proxies available
         """
         if not self.proxies:
-            self.fetch_proxies()
+            self._ensure_proxies()
             
         if not self.proxies:
             logger.warning("No proxies available")
@@ -213,9 +389,23 @@ class ProxyManager:
         
         # Check if we need to rotate proxy
         if self.request_count >= PROXY_ROTATION_FREQUENCY or self.current_proxy is None:
-            self.current_proxy = random.choice(self.proxies)
+            self.current_proxy = next(self._cycle)
             self.request_count = 0
-            logger.debug(f"Rotating to new proxy: {self.current_proxy['ip']}:{self.current_proxy['port']}")
+            logger.debug(f"Rotating to new proxy: {self.current_proxy.url}")
             
         self.request_count += 1
-        return self.current_proxy
\ No newline at end of file
+        return self.current_proxy
+    
+    def next_proxy(self) -> Optional[Proxy]:
+        """
+        Skip to the next proxy in rotation, e.g. after the current one failed
+        
+        Returns:
+            Proxy or None if no proxies available
+        """
+        self.current_proxy = None
+        return self.get_proxy()
+    
+    def close(self) -> None:
+        """Close the HTTP session"""
+        self.session.close()
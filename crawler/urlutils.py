@@ -0,0 +1,172 @@
+"""
+Memoized URL helpers for link extraction
+"""
+import os
+import hashlib
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode, ParseResult
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+from config.settings import ALLOWED_FILE_TYPES
+
+# Extensions of files that are downloaded rather than crawled as pages
+BINARY_EXTS = frozenset(ALLOWED_FILE_TYPES)
+
+# Query parameters that never change the page content
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid",
+    "sessionid", "session_id", "phpsessid", "jsessionid", "sid"
+})
+
+@lru_cache(maxsize=256)
+def _base_prefixes(base: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split a base URL into the prefixes relative links are appended to
+    
+    Args:
+        base: Base URL
+        
+    Returns:
+        Tuple (scheme, origin, directory), or None if the base needs urljoin
+    """
+    parts = urlsplit(base)
+    # urljoin collapses empty path segments of the base when merging paths
+    if (parts.scheme not in ("http", "https") or not parts.netloc
+            or ";" in parts.path or "//" in parts.path):
+        return None
+    origin = f"{parts.scheme}://{parts.netloc}"
+    directory = origin + (parts.path[:parts.path.rfind("/") + 1] or "/")
+    return parts.scheme, origin, directory
+
+def fast_urljoin(base: str, url: str) -> str:
+    """
+    Resolve a URL against an http(s) base URL
+    
+    Handles absolute, protocol-relative and plain relative links by string
+    concatenation, parsing the base only once; anything unusual (dot
+    segments, bare query/fragment, params, other schemes, empty path
+    segments in the base, brackets in the link) goes to urljoin, so invalid
+    IPv6 hosts raise ValueError just like urljoin.
+    
+    Args:
+        base: Base URL
+        url: Absolute or relative URL
+        
+    Returns:
+        Absolute URL, identical to urljoin(base, url)
+    """
+    prefixes = _base_prefixes(base)
+    if (prefixes is None or not url or url[0] in "?#. " or url[-1] in "?#"
+            or ";" in url or "/." in url or "?#" in url or not url.isprintable()):
+        return urljoin(base, url)
+    scheme, origin, directory = prefixes
+    
+    # Brackets mean an IPv6 host, which urljoin validates
+    if url.startswith(("http://", "https://")):
+        host_start = url.index("//") + 2
+        if url[host_start:host_start + 1] not in ("", "/", "?", "#") and "[" not in url and "]" not in url:
+            return url
+        return urljoin(base, url)
+    if url.startswith("//"):
+        if url[2:3] not in ("", "/", "?", "#") and "[" not in url and "]" not in url:
+            return f"{scheme}:{url}"
+        return urljoin(base, url)
+    if "//" in url:
+        # Empty path segments, which urljoin collapses
+        return urljoin(base, url)
+    if url[0] == "/":
+        return origin + url
+    if ":" in url.split("/", 1)[0]:
+        # Some other scheme (mailto:, tel:, javascript:)
+        return urljoin(base, url)
+    return directory + url
+
+@lru_cache(maxsize=4096)
+def cached_urlparse(url: str) -> ParseResult:
+    """
+    Parse a URL into its components (memoized)
+    
+    Args:
+        url: URL to parse
+        
+    Returns:
+        Parsed URL
+    """
+    return urlparse(url)
+
+def split_file_links(links: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Separate page links from links to downloadable files
+    
+    Args:
+        links: Absolute URLs
+        
+    Returns:
+        Tuple of (page links, file links), each in the original order
+    """
+    page_links = []
+    file_links = []
+    for link in links:
+        ext = os.path.splitext(cached_urlparse(link).path)[1].lstrip('.').lower()
+        if ext in BINARY_EXTS:
+            file_links.append(link)
+        else:
+            page_links.append(link)
+    return page_links, file_links
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to a canonical form for duplicate detection
+    
+    Lowercases scheme and host, drops default ports, the fragment and
+    tracking/session query parameters, and sorts the remaining parameters.
+    
+    Args:
+        url: Absolute URL
+        
+    Returns:
+        Canonical URL
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+def url_fingerprint(url: str) -> int:
+    """
+    Hash the canonical form of a URL to a 64-bit integer
+    
+    Args:
+        url: Absolute URL
+        
+    Returns:
+        64-bit fingerprint (xxh64 if xxhash is installed, else blake2b)
+    """
+    return hash64(canonicalize_url(url).encode("utf-8"))
+
+def hash64(data: bytes) -> int:
+    """
+    Hash bytes to a 64-bit integer
+    
+    Args:
+        data: Bytes to hash
+        
+    Returns:
+        64-bit hash (xxh64 if xxhash is installed, else blake2b)
+    """
+    if HAS_XXHASH:
+        return xxhash.xxh64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
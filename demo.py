@@ -4,8 +4,8 @@ Demonstration script to showcase data extraction capabilities
 """
 import asyncio
 import logging
-import argparse
 import pprint
+import sys
 
 from storage.mongodb import MongoDBConnector
 from extractors.admission import AdmissionExtractor
@@ -20,138 +20,174 @@ from utils.helpers import setup_logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _format_document(index, total, data):
+    """
+    Format one processed data document for display
+    
+    Args:
+        index: Position of the document in the listing (1-based)
+        total: Number of documents listed
+        data: Processed data document
+        
+    Returns:
+        List of output lines
+    """
+    lines = []
+    out = lines.append
+    
+    out(f"\nDocument {index}/{total}:")
+    out(f"College: {data.get('college_name')}")
+    out(f"Last Updated: {data.get('last_updated')}")
+    out(f"Confidence: {data.get('confidence_score')}")
+    
+    # Show specific data based on type
+    if "admission_data" in data:
+        out("\nAdmission Data:")
+        admission_data = data["admission_data"]
+        
+        # Show deadlines
+        if "application_deadlines" in admission_data and admission_data["application_deadlines"]:
+            out("\n  Application Deadlines:")
+            for deadline in admission_data["application_deadlines"][:3]:  # First 3
+                out(f"  - {deadline.get('date_str')} ({deadline.get('event_type')})")
+        
+        # Show courses
+        if "courses_offered" in admission_data and admission_data["courses_offered"]:
+            out("\n  Courses Offered:")
+            for course in admission_data["courses_offered"][:3]:  # First 3
+                out(f"  - {course.get('name')}")
+        
+        # Show seats
+        if "seats_available" in admission_data:
+            seats = admission_data["seats_available"]
+            out("\n  Seats:")
+            out(f"  - Total: {seats.get('total')}")
+            if "category_wise" in seats and seats["category_wise"]:
+                out("  - Categories:")
+                for category, count in list(seats["category_wise"].items())[:3]:  # First 3
+                    out(f"    * {category}: {count}")
+        
+        # Show fees
+        if "fee_structure" in admission_data:
+            fees = admission_data["fee_structure"]
+            out("\n  Fee Structure:")
+            if "course_wise" in fees and fees["course_wise"]:
+                out("  - Course-wise Fees:")
+                for course, fee in list(fees["course_wise"].items())[:3]:  # First 3
+                    out(f"    * {course}: {fee}")
+        
+        # Show hostel
+        if "hostel_facilities" in admission_data:
+            hostel = admission_data["hostel_facilities"]
+            out("\n  Hostel Facilities:")
+            out(f"  - Boys Hostel: {hostel.get('boys_hostel')}")
+            out(f"  - Girls Hostel: {hostel.get('girls_hostel')}")
+            out(f"  - Hostel Fee: {hostel.get('hostel_fee')}")
+        
+        # Show eligibility
+        if "eligibility_criteria" in admission_data:
+            eligibility = admission_data["eligibility_criteria"]
+            out("\n  Eligibility:")
+            out(f"  - Academic Requirements: {eligibility.get('academic_requirements')}")
+            if "entrance_exams" in eligibility and eligibility["entrance_exams"]:
+                out("  - Entrance Exams:")
+                for exam in eligibility["entrance_exams"]:
+                    out(f"    * {exam}")
+    
+    # Show placement data
+    elif "placement_data" in data:
+        out("\nPlacement Data:")
+        placement_data = data["placement_data"]
+        
+        # Show statistics
+        if "statistics" in placement_data:
+            stats = placement_data["statistics"]
+            out("\n  Placement Statistics:")
+            out(f"  - Average Package: {stats.get('avg_package')}")
+            out(f"  - Highest Package: {stats.get('highest_package')}")
+            out(f"  - Placement %: {stats.get('placement_percentage')}%")
+            out(f"  - Students Placed: {stats.get('students_placed_count')}/{stats.get('total_students')}")
+        
+        # Show recruiters
+        if "recruiters" in placement_data:
+            recruiters = placement_data["recruiters"]
+            out("\n  Recruiters:")
+            out(f"  - Total Companies: {recruiters.get('total_companies_visited')}")
+            if "top_companies" in recruiters and recruiters["top_companies"]:
+                out("  - Top Companies:")
+                for company in recruiters["top_companies"][:5]:  # First 5
+                    out(f"    * {company}")
+        
+        # Show historical data
+        if "historical_data" in placement_data and "year_wise" in placement_data["historical_data"]:
+            historical = placement_data["historical_data"]["year_wise"]
+            if historical:
+                out("\n  Historical Data:")
+                for year, data in list(historical.items())[:3]:  # First 3 years
+                    out(f"  - {year}: {data}")
+        
+        # Show internships
+        if "internships" in placement_data:
+            internships = placement_data["internships"]
+            out("\n  Internships:")
+            out(f"  - Count: {internships.get('count')}")
+            out(f"  - Percentage: {internships.get('percentage')}%")
+            if "companies" in internships and internships["companies"]:
+                out("  - Companies:")
+                for company in internships["companies"][:3]:  # First 3
+                    out(f"    * {company}")
+    
+    out("\n" + "-"*80)
+    
+    return lines
+
 async def show_extracted_data(college_name=None, data_type=None):
     """Show extracted data from MongoDB"""
     db = MongoDBConnector()
     
+    # Collect the report and write it in one go
+    lines = []
+    out = lines.append
+    
     try:
         # Build query
         query = {}
         if college_name:
             query["college_name"] = college_name
+        if data_type:
+            query[f"{data_type}_data"] = {"$exists": True}
         
-        # Get processed data
-        processed_data = db.get_processed_data(query)
+        # Only the fields printed below are fetched
+        projection = {
+            "college_name": 1, "last_updated": 1, "confidence_score": 1,
+            "admission_data": 1, "placement_data": 1
+        }
         
-        print(f"\n{'='*80}")
-        print(f"Found {len(processed_data)} processed data documents")
-        print(f"{'='*80}\n")
+        # Run the count and the fetch side by side instead of blocking the loop
+        count, processed_data = await asyncio.gather(
+            asyncio.to_thread(db.count_processed_data, query),
+            asyncio.to_thread(db.get_processed_data, query, projection=projection, limit=5)
+        )
         
-        # Filter by data type if specified
+        out(f"\n{'='*80}")
         if data_type:
-            processed_data = [data for data in processed_data 
-                             if (data_type == "admission" and "admission_data" in data) or 
-                                (data_type == "placement" and "placement_data" in data)]
-            
-            print(f"Filtered to {len(processed_data)} {data_type} documents\n")
+            out(f"Found {count} processed {data_type} documents")
+        else:
+            out(f"Found {count} processed data documents")
+        out(f"{'='*80}\n")
         
-        # Display data
-        for i, data in enumerate(processed_data[:5], 1):  # Show first 5 only
-            print(f"\nDocument {i}/{min(5, len(processed_data))}:")
-            print(f"College: {data.get('college_name')}")
-            print(f"Last Updated: {data.get('last_updated')}")
-            print(f"Confidence: {data.get('confidence_score')}")
-            
-            # Show specific data based on type
-            if "admission_data" in data:
-                print("\nAdmission Data:")
-                admission_data = data["admission_data"]
-                
-                # Show deadlines
-                if "application_deadlines" in admission_data and admission_data["application_deadlines"]:
-                    print("\n  Application Deadlines:")
-                    for deadline in admission_data["application_deadlines"][:3]:  # First 3
-                        print(f"  - {deadline.get('date_str')} ({deadline.get('event_type')})")
-                
-                # Show courses
-                if "courses_offered" in admission_data and admission_data["courses_offered"]:
-                    print("\n  Courses Offered:")
-                    for course in admission_data["courses_offered"][:3]:  # First 3
-                        print(f"  - {course.get('name')}")
-                
-                # Show seats
-                if "seats_available" in admission_data:
-                    seats = admission_data["seats_available"]
-                    print("\n  Seats:")
-                    print(f"  - Total: {seats.get('total')}")
-                    if "category_wise" in seats and seats["category_wise"]:
-                        print("  - Categories:")
-                        for category, count in list(seats["category_wise"].items())[:3]:  # First 3
-                            print(f"    * {category}: {count}")
-                
-                # Show fees
-                if "fee_structure" in admission_data:
-                    fees = admission_data["fee_structure"]
-                    print("\n  Fee Structure:")
-                    if "course_wise" in fees and fees["course_wise"]:
-                        print("  - Course-wise Fees:")
-                        for course, fee in list(fees["course_wise"].items())[:3]:  # First 3
-                            print(f"    * {course}: {fee}")
-                
-                # Show hostel
-                if "hostel_facilities" in admission_data:
-                    hostel = admission_data["hostel_facilities"]
-                    print("\n  Hostel Facilities:")
-                    print(f"  - Boys Hostel: {hostel.get('boys_hostel')}")
-                    print(f"  - Girls Hostel: {hostel.get('girls_hostel')}")
-                    print(f"  - Hostel Fee: {hostel.get('hostel_fee')}")
-                
-                # Show eligibility
-                if "eligibility_criteria" in admission_data:
-                    eligibility = admission_data["eligibility_criteria"]
-                    print("\n  Eligibility:")
-                    print(f"  - Academic Requirements: {eligibility.get('academic_requirements')}")
-                    if "entrance_exams" in eligibility and eligibility["entrance_exams"]:
-                        print("  - Entrance Exams:")
-                        for exam in eligibility["entrance_exams"]:
-                            print(f"    * {exam}")
-            
-            # Show placement data
-            elif "placement_data" in data:
-                print("\nPlacement Data:")
-                placement_data = data["placement_data"]
-                
-                # Show statistics
-                if "statistics" in placement_data:
-                    stats = placement_data["statistics"]
-                    print("\n  Placement Statistics:")
-                    print(f"  - Average Package: {stats.get('avg_package')}")
-                    print(f"  - Highest Package: {stats.get('highest_package')}")
-                    print(f"  - Placement %: {stats.get('placement_percentage')}%")
-                    print(f"  - Students Placed: {stats.get('students_placed_count')}/{stats.get('total_students')}")
-                
-                # Show recruiters
-                if "recruiters" in placement_data:
-                    recruiters = placement_data["recruiters"]
-                    print("\n  Recruiters:")
-                    print(f"  - Total Companies: {recruiters.get('total_companies_visited')}")
-                    if "top_companies" in recruiters and recruiters["top_companies"]:
-                        print("  - Top Companies:")
-                        for company in recruiters["top_companies"][:5]:  # First 5
-                            print(f"    * {company}")
-                
-                # Show historical data
-                if "historical_data" in placement_data and "year_wise" in placement_data["historical_data"]:
-                    historical = placement_data["historical_data"]["year_wise"]
-                    if historical:
-                        print("\n  Historical Data:")
-                        for year, data in list(historical.items())[:3]:  # First 3 years
-                            print(f"  - {year}: {data}")
-                
-                # Show internships
-                if "internships" in placement_data:
-                    internships = placement_data["internships"]
-                    print("\n  Internships:")
-                    print(f"  - Count: {internships.get('count')}")
-                    print(f"  - Percentage: {internships.get('percentage')}%")
-                    if "companies" in internships and internships["companies"]:
-                        print("  - Companies:")
-                        for company in internships["companies"][:3]:  # First 3
-                            print(f"    * {company}")
-            
-            print("\n" + "-"*80)
+        # Format the documents in worker threads; gather keeps their order
+        total = min(5, len(processed_data))
+        documents = await asyncio.gather(*(
+            asyncio.to_thread(_format_document, i, total, data)
+            for i, data in enumerate(processed_data[:5], 1)  # Show first 5 only
+        ))
+        for document_lines in documents:
+            lines.extend(document_lines)
     
     finally:
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
         db.close()
 
 async def demo_extraction(url=None, college_name="Demo College"):
@@ -166,6 +202,7 @@ async def demo_extraction(url=None, college_name="Demo College"):
     try:
         # Initialize crawler and navigate to URL
         from crawler.crawler import CollegeCrawler
+        from selectolax.lexbor import LexborHTMLParser
         
         print(f"\n{'='*80}")
         print(f"Demonstrating extraction from: {url}")
@@ -185,29 +222,35 @@ async def demo_extraction(url=None, college_name="Demo College"):
         print(f"Successfully loaded page: {page_data['url']}")
         
         # Determine page type
-        page_type = crawler._determine_page_type(page_data['content'])
+        tree = LexborHTMLParser(page_data['content'])
+        page_type = crawler._determine_page_type(tree)
         print(f"Detected page type: {page_type}")
         
         # Extract content
-        content = crawler._extract_main_content(page_data['content'])
+        content = crawler._extract_main_content(tree)
         print(f"Extracted {len(content)} characters of content")
         
+        # Progress lines above print as they happen; the results are
+        # collected and written in one go
+        lines = []
+        out = lines.append
+        
         # Process based on page type
         if page_type == "admission":
             print("\nProcessing as admission page...")
             admission_extractor = AdmissionExtractor(ai_processor)
             processed_data = admission_extractor.extract_admission_data(content, college_name)
             
-            print("\nExtracted Admission Data:")
-            pprint.pprint(processed_data["admission_data"])
+            out("\nExtracted Admission Data:")
+            out(pprint.pformat(processed_data["admission_data"]))
             
         elif page_type == "placement":
             print("\nProcessing as placement page...")
             placement_extractor = PlacementExtractor(ai_processor)
             processed_data = placement_extractor.extract_placement_data(content, college_name)
             
-            print("\nExtracted Placement Data:")
-            pprint.pprint(processed_data["placement_data"])
+            out("\nExtracted Placement Data:")
+            out(pprint.pformat(processed_data["placement_data"]))
         
         # Extract tables
         from extractors.base import BaseExtractor
@@ -215,14 +258,15 @@ async def demo_extraction(url=None, college_name="Demo College"):
         tables = base_extractor.extract_tables(page_data['content'])
         
         if tables:
-            print(f"\nFound {len(tables)} tables on the page")
+            out(f"\nFound {len(tables)} tables on the page")
             for i, table in enumerate(tables[:2], 1):  # Show first 2 tables
-                print(f"\nTable {i} Headers: {table.get('headers')}")
-                print(f"Table {i} Rows: {len(table.get('rows', []))}")
+                out(f"\nTable {i} Headers: {table.get('headers')}")
+                out(f"Table {i} Rows: {len(table.get('rows', []))}")
                 if table.get('rows'):
-                    print(f"First row: {table['rows'][0]}")
+                    out(f"First row: {table['rows'][0]}")
         
-        print("\nExtraction demo completed")
+        out("\nExtraction demo completed")
+        sys.stdout.write("\n".join(lines) + "\n")
         
     except Exception as e:
         logger.error(f"Error in demo: {e}")
@@ -232,17 +276,73 @@ async def demo_extraction(url=None, college_name="Demo College"):
         # Close browser and other resources
         if 'crawler' in locals():
             await crawler.close()
+            from crawler.browser import BrowserPool
+            await BrowserPool.shutdown()
         await ai_processor.close()
 
+# Four flags don't need argparse; parsing them by hand keeps startup short
+USAGE = """usage: demo.py [-h] [--view] [--college COLLEGE] [--type {admission,placement}] [--url URL]
+
+College Data Extraction Demo
+
+options:
+  -h, --help            show this help message and exit
+  --view                View extracted data in MongoDB
+  --college COLLEGE     College name to filter
+  --type {admission,placement}
+                        Data type to filter
+  --url URL             URL to demonstrate extraction on"""
+
+DATA_TYPES = ('admission', 'placement')
+
+def _get_option(argv, flag):
+    """
+    Get the value given for a command line option
+    
+    Args:
+        argv: Command line arguments
+        flag: Option name (e.g. '--url')
+        
+    Returns:
+        The token after the flag (or after '=' in '--flag=value'), or None if not given
+    """
+    prefix = flag + '='
+    for i, arg in enumerate(argv):
+        if arg == flag:
+            if i + 1 >= len(argv):
+                sys.exit(f"demo.py: error: argument {flag}: expected one argument")
+            return argv[i + 1]
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return None
+
+def parse_args(argv):
+    """
+    Parse the demo's command line
+    
+    Args:
+        argv: Command line arguments without the program name
+        
+    Returns:
+        Dictionary with view, college, type and url entries
+    """
+    if '-h' in argv or '--help' in argv:
+        print(USAGE)
+        sys.exit(0)
+    
+    args = {
+        'view': '--view' in argv,
+        'college': _get_option(argv, '--college'),
+        'type': _get_option(argv, '--type'),
+        'url': _get_option(argv, '--url')
+    }
+    if args['type'] is not None and args['type'] not in DATA_TYPES:
+        sys.exit(f"demo.py: error: argument --type: invalid choice: '{args['type']}' (choose from {', '.join(DATA_TYPES)})")
+    return args
+
 async def main():
     """Main function"""
-    parser = argparse.ArgumentParser(description="College Data Extraction Demo")
-    parser.add_argument('--view', action='store_true', help='View extracted data in MongoDB')
-    parser.add_argument('--college', type=str, help='College name to filter')
-    parser.add_argument('--type', choices=['admission', 'placement'], help='Data type to filter')
-    parser.add_argument('--url', type=str, help='URL to demonstrate extraction on')
-    
-    args = parser.parse_args()
+    args = parse_args(sys.argv[1:])
     
     # Setup logging
     setup_logging("INFO")
@@ -250,12 +350,12 @@ async def main():
     print(f"\nCollege Website Data Extraction System Demo")
     print(f"MongoDB Database: {MONGODB_DB_NAME}\n")
     
-    if args.view:
-        await show_extracted_data(args.college, args.type)
-    elif args.url:
-        await demo_extraction(args.url, args.college or "Demo College")
+    if args['view']:
+        await show_extracted_data(args['college'], args['type'])
+    elif args['url']:
+        await demo_extraction(args['url'], args['college'] or "Demo College")
     else:
-        parser.print_help()
+        print(USAGE)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,14 +1,19 @@
 """
 Image extractor for processing image files using OCR and chart recognition
 """
+import copy
 import logging
 import os
 import requests
 import tempfile
 from typing import Dict, List, Any, Optional
 import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from extractors.base import BaseExtractor
+from config.settings import IMAGE_AI_CACHE_ITEMS
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +23,47 @@ class ImageExtractor(BaseExtractor):
     def __init__(self, ai_processor=None):
         """Initialize image extractor"""
         super().__init__(ai_processor)
+        # The methods below ask the AI API about the same images; results are
+        # kept per (call, file) so each question is only sent once
+        self._ai_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._ai_cache_lock = threading.Lock()
+    
+    def _ai_image_call(self, operation: str, image_path: str) -> Any:
+        """
+        Call an image method of the AI processor, reusing an earlier result
+        for the same unchanged file
+        
+        Only non-empty results are kept, so a failed call is retried next
+        time, and each caller gets its own copy of a cached result.
+        
+        Args:
+            operation: AI processor method name (e.g. 'process_image_ocr')
+            image_path: Path to the image file
+            
+        Returns:
+            Result of the AI processor method
+        """
+        try:
+            stat = os.stat(image_path)
+            key = (operation, image_path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        
+        if key is not None:
+            with self._ai_cache_lock:
+                if key in self._ai_cache:
+                    self._ai_cache.move_to_end(key)
+                    return copy.deepcopy(self._ai_cache[key])
+        
+        result = getattr(self.ai_processor, operation)(image_path)
+        
+        # The processor returns None/{}/[] when the API call fails
+        if key is not None and result:
+            with self._ai_cache_lock:
+                self._ai_cache[key] = copy.deepcopy(result)
+                while len(self._ai_cache) > IMAGE_AI_CACHE_ITEMS:
+                    self._ai_cache.popitem(last=False)
+        return result
     
     def extract_from_image(self, image_path: str) -> Dict[str, Any]:
         """
@@ -39,21 +85,28 @@ class ImageExtractor(BaseExtractor):
                 "elements": []
             }
             
-            # Use AI processor to extract text via OCR
             if self.ai_processor:
-                ocr_result = self.ai_processor.process_image_ocr(image_path)
+                # OCR, chart analysis and table detection are independent API
+                # calls - send them at the same time
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    ocr_future = executor.submit(self._ai_image_call, 'process_image_ocr', image_path)
+                    chart_future = executor.submit(self._ai_image_call, 'process_image_chart', image_path)
+                    table_future = executor.submit(self._ai_image_call, 'detect_tables_in_image', image_path)
+                
+                # Use AI processor to extract text via OCR
+                ocr_result = ocr_future.result()
                 if ocr_result:
                     result["text"] = ocr_result.get("full_text", "")
                     result["elements"] = ocr_result.get("items", [])
                 
                 # Check if image is a chart
-                chart_result = self.ai_processor.process_image_chart(image_path)
+                chart_result = chart_future.result()
                 if chart_result:
                     result["is_chart"] = True
                     result["chart_data"] = chart_result
                     
                 # Check for tables in the image
-                table_result = self.ai_processor.detect_tables_in_image(image_path)
+                table_result = table_future.result()
                 if table_result:
                     result["tables"] = table_result
             
@@ -85,19 +138,19 @@ class ImageExtractor(BaseExtractor):
         if self.ai_processor:
             try:
                 # Check if it's a chart
-                chart_result = self.ai_processor.process_image_chart(image_path)
+                chart_result = self._ai_image_call('process_image_chart', image_path)
                 if chart_result and chart_result.get("chart_type", "unknown") != "unknown":
                     return "chart"
                 
                 # Check if it contains tables
-                table_result = self.ai_processor.detect_tables_in_image(image_path)
+                table_result = self._ai_image_call('detect_tables_in_image', image_path)
                 if table_result and len(table_result) > 0:
                     return "table"
                 
                 # If not a chart or table, check text density
                 text = extracted_text
                 if not text:
-                    ocr_result = self.ai_processor.process_image_ocr(image_path)
+                    ocr_result = self._ai_image_call('process_image_ocr', image_path)
                     if ocr_result:
                         text = ocr_result.get("full_text", "")
                 
@@ -129,7 +182,7 @@ class ImageExtractor(BaseExtractor):
         """
         if self.ai_processor:
             try:
-                chart_result = self.ai_processor.process_image_chart(image_path)
+                chart_result = self._ai_image_call('process_image_chart', image_path)
                 return chart_result
             except Exception as e:
                 logger.error(f"Error extracting data from chart {image_path}: {e}")
@@ -152,7 +205,7 @@ class ImageExtractor(BaseExtractor):
         if self.ai_processor:
             try:
                 # Detect tables in the image
-                tables = self.ai_processor.detect_tables_in_image(image_path)
+                tables = self._ai_image_call('detect_tables_in_image', image_path)
                 
                 # If tables found, extract text for each table region
                 if tables:
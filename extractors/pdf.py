@@ -2,50 +2,165 @@
 PDF extractor for processing PDF documents
 """
 import logging
+import math
 import re
 import os
 import fitz  # PyMuPDF
 from typing import Dict, List, Any, Optional, Tuple
 from bs4 import BeautifulSoup
+import shutil
 import tempfile
+from functools import partial
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 from extractors.base import BaseExtractor
+from config.settings import PDF_POOL_WORKERS, PDF_PAGES_PER_TASK, PDF_PARALLEL_MIN_PAGES, PDF_DOC_CACHE_ITEMS
 
 logger = logging.getLogger(__name__)
 
+# Block prefixes treated as list items by extract_text_with_formatting
+_BULLET_CHARS = ("•", "-", "*")
+_BULLET_RE = re.compile(r"^\d+\.")
+
+def _process_page_range(pdf_path: str, page_indices: List[int], temp_dir: Optional[str] = None,
+                        include_text: bool = True, include_tables: bool = True
+                        ) -> List[Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Extract text, tables and images from some pages of a PDF
+    
+    Runs in a worker process, so it opens the document itself.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_indices: Zero-based numbers of the pages to process
+        temp_dir: Directory the extracted images are written to, None to skip images
+        include_text: Whether to extract the page text
+        include_tables: Whether to extract tables
+        
+    Returns:
+        (page_text, tables, images) for each page, in the order given; skipped
+        parts are left empty
+    """
+    with fitz.open(pdf_path) as doc:
+        return PDFExtractor()._extract_pages(doc, pdf_path, page_indices, temp_dir, include_text, include_tables)
+
 class PDFExtractor(BaseExtractor):
     """Extractor for PDF documents"""
     
     def __init__(self, ai_processor=None):
         """Initialize PDF extractor"""
         super().__init__(ai_processor)
+        # Callers often run several methods on the same file; keep it open
+        # instead of parsing the xref table and page tree every time
+        self._doc_cache: "OrderedDict[str, Tuple[tuple, fitz.Document]]" = OrderedDict()
+        # Worker processes for larger PDFs, started on first use
+        self._page_pool: Optional[ProcessPoolExecutor] = None
+    
+    def _open_doc(self, pdf_path: str) -> fitz.Document:
+        """
+        Open a PDF, reusing the document from an earlier call if the file is unchanged
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Open PyMuPDF document, owned by the cache (see close_cached)
+        """
+        stat = os.stat(pdf_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        
+        cached = self._doc_cache.get(pdf_path)
+        if cached is not None:
+            if cached[0] == stamp:
+                self._doc_cache.move_to_end(pdf_path)
+                return cached[1]
+            cached[1].close()
+        
+        doc = fitz.open(pdf_path)
+        self._doc_cache[pdf_path] = (stamp, doc)
+        self._doc_cache.move_to_end(pdf_path)
+        while len(self._doc_cache) > PDF_DOC_CACHE_ITEMS:
+            _, (_, old_doc) = self._doc_cache.popitem(last=False)
+            old_doc.close()
+        return doc
+    
+    def close_cached(self) -> None:
+        """Close the documents kept open by _open_doc"""
+        for _, doc in self._doc_cache.values():
+            doc.close()
+        self._doc_cache.clear()
+    
+    def close(self) -> None:
+        """Close cached documents and stop the page worker processes"""
+        self.close_cached()
+        if self._page_pool is not None:
+            self._page_pool.shutdown(wait=False, cancel_futures=True)
+            self._page_pool = None
+    
+    def _extract_pages(self, doc: fitz.Document, pdf_path: str, page_indices: List[int],
+                       temp_dir: Optional[str], include_text: bool, include_tables: bool
+                       ) -> List[Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        Extract text, tables and images from some pages of an open PDF
+        
+        Args:
+            doc: Open PDF document
+            pdf_path: Path to the PDF file (for log messages)
+            page_indices: Zero-based numbers of the pages to process
+            temp_dir: Directory the extracted images are written to, None to skip images
+            include_text: Whether to extract the page text
+            include_tables: Whether to extract tables
+            
+        Returns:
+            (page_text, tables, images) for each page, in the order given
+        """
+        results = []
+        for page_num in page_indices:
+            page = doc[page_num]
+            results.append((
+                page.get_text() if include_text else "",
+                self._extract_tables_from_page(page) if include_tables else [],
+                self._extract_images_from_page(page, pdf_path, page_num, temp_dir) if temp_dir else []
+            ))
+        return results
     
-    def extract_from_pdf(self, pdf_path: str) -> Dict[str, Any]:
+    def extract_from_pdf(self, pdf_path: str, include_text: bool = True,
+                         include_tables: bool = True, include_images: bool = True) -> Dict[str, Any]:
         """
         Extract text and structured content from PDF
         
         Args:
             pdf_path: Path to the PDF file
+            include_text: Whether to extract the text of the pages
+            include_tables: Whether to extract tables
+            include_images: Whether to extract images (decoded and written to disk)
             
         Returns:
             Dict with extracted content
         """
+        temp_dir = None
         try:
+            # All images of the document share one directory
+            if include_images:
+                temp_dir = tempfile.mkdtemp(prefix="pdfimg_")
             result = {
                 "success": True,
                 "text": "",
                 "tables": [],
                 "images": [],
                 "metadata": {},
-                "pages": 0
+                "pages": 0,
+                "temp_dir": temp_dir
             }
             
             # Open the PDF
-            doc = fitz.open(pdf_path)
-            result["pages"] = len(doc)
+            doc = self._open_doc(pdf_path)
+            page_count = len(doc)
+            metadata = doc.metadata
+            result["pages"] = page_count
             
             # Extract metadata
-            metadata = doc.metadata
             if metadata:
                 result["metadata"] = {
                     "title": metadata.get("title", ""),
@@ -58,15 +173,38 @@ class PDFExtractor(BaseExtractor):
                     "modification_date": metadata.get("modDate", "")
                 }
             
-            # Extract text and tables from all pages
-            full_text = ""
-            for page_num, page in enumerate(doc):
+            # Extract text, tables and images from all pages - pages are
+            # independent, so larger PDFs are split across worker processes
+            if page_count < PDF_PARALLEL_MIN_PAGES or PDF_POOL_WORKERS < 2:
+                page_results = self._extract_pages(
+                    doc, pdf_path, list(range(page_count)), temp_dir, include_text, include_tables
+                )
+            else:
+                process_pages = partial(
+                    _process_page_range, pdf_path, temp_dir=temp_dir,
+                    include_text=include_text, include_tables=include_tables
+                )
+                # Small enough chunks that every worker gets pages
+                chunk_size = min(PDF_PAGES_PER_TASK, math.ceil(page_count / PDF_POOL_WORKERS))
+                chunks = [
+                    list(range(start, min(start + chunk_size, page_count)))
+                    for start in range(0, page_count, chunk_size)
+                ]
+                if self._page_pool is None:
+                    self._page_pool = ProcessPoolExecutor(max_workers=PDF_POOL_WORKERS)
+                page_results = [
+                    page_result
+                    for chunk_results in self._page_pool.map(process_pages, chunks)
+                    for page_result in chunk_results
+                ]
+            
+            text_parts = []
+            for page_num, (page_text, tables, images) in enumerate(page_results):
                 # Extract text
-                page_text = page.get_text()
-                full_text += page_text + "\n\n"
+                if include_text:
+                    text_parts.append(page_text + "\n\n")
                 
                 # Extract tables
-                tables = self._extract_tables_from_page(page)
                 if tables:
                     for i, table in enumerate(tables):
                         table["page"] = page_num + 1
@@ -74,14 +212,20 @@ class PDFExtractor(BaseExtractor):
                         result["tables"].append(table)
                 
                 # Extract images
-                images = self._extract_images_from_page(page, pdf_path, page_num)
                 result["images"].extend(images)
             
-            result["text"] = full_text
+            result["text"] = "".join(text_parts)
+            
+            # Nothing to clean up later if the PDF has no images
+            if temp_dir and not result["images"]:
+                os.rmdir(temp_dir)
+                result["temp_dir"] = None
             
             return result
         except Exception as e:
             logger.error(f"Error extracting content from PDF {pdf_path}: {e}")
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
             return {
                 "success": False,
                 "error": str(e),
@@ -105,7 +249,16 @@ class PDFExtractor(BaseExtractor):
         tables = []
         
         try:
-            # Get blocks that might represent tables
+            # Ruled tables are detected by PyMuPDF itself from the page's
+            # vector graphics
+            for table in page.find_tables(strategy="lines_strict"):
+                table_data = self._process_found_table(table)
+                if table_data["rows"]:
+                    tables.append(table_data)
+            if tables:
+                return tables
+            
+            # Fall back to span alignment for tables drawn without lines
             blocks = page.get_text("dict")["blocks"]
             
             # Identify potential table blocks
@@ -124,6 +277,28 @@ class PDFExtractor(BaseExtractor):
             logger.error(f"Error extracting tables from page: {e}")
             return []
     
+    def _process_found_table(self, table: Any) -> Dict[str, Any]:
+        """
+        Convert a table found by page.find_tables() to the table format
+        
+        Args:
+            table: PyMuPDF Table object
+            
+        Returns:
+            Structured table data
+        """
+        cells = [[(cell or "").strip() for cell in row] for row in table.extract()]
+        headers = [(name or "").strip() for name in table.header.names]
+        
+        # Unless the header sits above the table, it is the first extracted row
+        data_rows = cells if table.header.external else cells[1:]
+        
+        return {
+            "headers": headers,
+            "rows": [row for row in data_rows if any(row)],
+            "raw_text": "\n".join(" | ".join(row) for row in cells)
+        }
+    
     def _is_potential_table(self, lines: List[Dict[str, Any]]) -> bool:
         """
         Check if a set of lines potentially represents a table
@@ -256,14 +431,16 @@ class PDFExtractor(BaseExtractor):
         
         return table_data
     
-    def _extract_images_from_page(self, page: fitz.Page, pdf_path: str, page_num: int) -> List[Dict[str, Any]]:
+    def _extract_images_from_page(self, page: fitz.Page, pdf_path: str, page_num: int,
+                                  temp_dir: str) -> List[Dict[str, Any]]:
         """
         Extract images from a PDF page
         
         Args:
             page: PDF page object
-            pdf_path: Path to the PDF file (for generating image filenames)
+            pdf_path: Path to the PDF file (for log messages)
             page_num: Page number
+            temp_dir: Directory the images are written to
             
         Returns:
             List of extracted image information
@@ -283,10 +460,10 @@ class PDFExtractor(BaseExtractor):
                     base_image = page.parent.extract_image(xref)
                     
                     if base_image:
-                        # Create a temporary file
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{base_image['ext']}") as temp_file:
-                            temp_file.write(base_image["image"])
-                            temp_path = temp_file.name
+                        image_id = f"page{page_num+1}_img{img_idx+1}"
+                        temp_path = os.path.join(temp_dir, f"{image_id}.{base_image['ext']}")
+                        with open(temp_path, "wb") as image_file:
+                            image_file.write(base_image["image"])
                         
                         # Get image dimensions
                         width = base_image.get("width", 0)
@@ -294,7 +471,7 @@ class PDFExtractor(BaseExtractor):
                         
                         images.append({
                             "page": page_num + 1,
-                            "image_id": f"page{page_num+1}_img{img_idx+1}",
+                            "image_id": image_id,
                             "path": temp_path,
                             "width": width,
                             "height": height,
@@ -360,34 +537,25 @@ class PDFExtractor(BaseExtractor):
             Extracted text with some formatting preserved
         """
         try:
-            doc = fitz.open(pdf_path)
-            formatted_text = ""
+            doc = self._open_doc(pdf_path)
+            text_parts = []
             
             for page in doc:
-                # Get blocks
-                blocks = page.get_text("dict")["blocks"]
+                # Plain (x0, y0, x1, y1, text, block_no, block_type) tuples -
+                # the span details of "dict" output are not needed here
+                blocks = page.get_text("blocks")
                 
                 for block in blocks:
-                    if block["type"] == 0:  # Text block
-                        block_text = ""
-                        
-                        for line in block.get("lines", []):
-                            line_text = ""
-                            for span in line.get("spans", []):
-                                line_text += span["text"]
-                            
-                            if line_text.strip():
-                                block_text += line_text + " "
-                        
-                        block_text = block_text.strip()
+                    if block[6] == 0:  # Text block
+                        block_text = " ".join(line for line in block[4].split("\n") if line.strip()).strip()
                         if block_text:
                             # Check if this is likely a bullet point
-                            if block_text.startswith("•") or block_text.startswith("-") or re.match(r"^\d+\.", block_text):
-                                formatted_text += block_text + "\n"
+                            if block_text.startswith(_BULLET_CHARS) or _BULLET_RE.match(block_text):
+                                text_parts.append(block_text + "\n")
                             else:
-                                formatted_text += block_text + "\n\n"
+                                text_parts.append(block_text + "\n\n")
             
-            return formatted_text
+            return "".join(text_parts)
         except Exception as e:
             logger.error(f"Error extracting formatted text from PDF {pdf_path}: {e}")
             return ""
@@ -399,6 +567,11 @@ class PDFExtractor(BaseExtractor):
         Args:
             extracted_data: Extracted data containing image paths
         """
+        temp_dir = extracted_data.get("temp_dir")
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+        
         for image in extracted_data.get("images", []):
             try:
                 if "path" in image and os.path.exists(image["path"]):
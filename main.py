@@ -11,7 +11,8 @@ import traceback
 from typing import Dict, List, Any, Optional
 
 from config.settings import LOG_LEVEL, LOG_FILE, USE_PROXIES
-from config.targets import TARGET_COLLEGES
+from config.targets import TARGET_COLLEGES, get_by_alias
+from crawler.browser import BrowserPool
 from crawler.crawler import CollegeCrawler
 from utils.helpers import setup_logging, format_datetime
 
@@ -122,7 +123,7 @@ async def main() -> None:
     parser.add_argument('--college', type=str, help='Specific college to crawl (by name)')
     parser.add_argument('--list', action='store_true', help='List available target colleges')
     parser.add_argument('--process-only', action='store_true', help='Only process existing data, no crawling')
-    parser.add_argument('--no-browser', action='store_true', help='Disable browser automation (use requests only)')
+    parser.add_argument('--no-browser', action='store_true', help='Disable browser automation (plain HTTP fetching only)')
     
     args = parser.parse_args()
     
@@ -148,9 +149,13 @@ async def main() -> None:
     # Filter colleges by name if specified
     colleges_to_crawl = []
     if args.college:
-        for college in TARGET_COLLEGES:
-            if args.college.lower() in college['name'].lower():
-                colleges_to_crawl.append(college)
+        exact = get_by_alias(args.college)
+        if exact:
+            colleges_to_crawl.append(exact)
+        else:
+            for college in TARGET_COLLEGES:
+                if args.college.lower() in college['name'].lower():
+                    colleges_to_crawl.append(college)
         
         if not colleges_to_crawl:
             logger.error(f"No matching college found for: {args.college}")
@@ -160,9 +165,12 @@ async def main() -> None:
     
     logger.info(f"Will crawl {len(colleges_to_crawl)} colleges")
     
-    # Crawl each college sequentially
-    for college in colleges_to_crawl:
-        await crawl_college(college, use_browser=not args.no_browser)
+    # Crawl each college sequentially (sharing one browser)
+    try:
+        for college in colleges_to_crawl:
+            await crawl_college(college, use_browser=not args.no_browser)
+    finally:
+        await BrowserPool.shutdown()
     
     # Process the crawled data
     logger.info("Crawling complete. Starting data processing...")
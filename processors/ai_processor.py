@@ -6,12 +6,14 @@ import logging
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import asyncio
 
-from config.settings import HF_API_ENDPOINTS
+from config.settings import HF_API_ENDPOINTS, HTTP_POOL_LIMIT_PER_HOST
+from processors.hf_client import HFBatchClient
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,14 @@ class AIProcessor:
         """Initialize the AI processor"""
         self.api_endpoints = HF_API_ENDPOINTS
         self.session = None
+        self.batch_client = HFBatchClient(self._get_session)
+        
+        # Keep-alive session for the synchronous calls - every endpoint is on
+        # the same host, so one TLS connection is reused instead of one per call
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_LIMIT_PER_HOST)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
     
     async def _get_session(self):
         """Get or create an aiohttp session"""
@@ -36,7 +46,9 @@ class AIProcessor:
         return self.session
     
     async def close(self):
-        """Close the aiohttp session"""
+        """Close the batch client and the HTTP sessions"""
+        await self.batch_client.close()
+        self.http.close()
         if self.session and not self.session.closed:
             await self.session.close()
     
@@ -67,7 +79,7 @@ class AIProcessor:
             truncated_content = content[:10000]
             
             # Send request to the AI endpoint
-            response = requests.post(
+            response = self.http.post(
                 endpoint,
                 json={"text": truncated_content},
                 timeout=30
@@ -85,6 +97,51 @@ class AIProcessor:
             # Return a default classification to avoid failures
             return {"class": "general", "confidence": 0.8}
     
+    async def classify_content_async(self, content: str) -> Dict[str, Any]:
+        """
+        Classify content type using AI, batched with other pending requests
+        
+        Args:
+            content: Text content to classify
+            
+        Returns:
+            Classification result
+        """
+        try:
+            if await self._get_session() is None:
+                return await asyncio.to_thread(self.classify_content, content)
+            
+            # Truncate content to avoid excessive request size
+            result = await self.batch_client.submit("classify_document", {"text": content[:10000]})
+            if result:
+                return result.get("classification", {})
+        except Exception as e:
+            logger.error(f"Error classifying content: {e}")
+        # Return a default classification to avoid failures
+        return {"class": "general", "confidence": 0.8}
+    
+    async def extract_entities_async(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Extract named entities from content, batched with other pending requests
+        
+        Args:
+            text: Text content to process
+            
+        Returns:
+            List of extracted entities
+        """
+        try:
+            if await self._get_session() is None:
+                return await asyncio.to_thread(self.extract_entities, text)
+            
+            # Truncate content to avoid excessive request size
+            result = await self.batch_client.submit("extract_entities", {"text": text[:10000]})
+            if result:
+                return result.get("entities", [])
+        except Exception as e:
+            logger.error(f"Error extracting entities: {e}")
+        return []
+    
     def extract_entities(self, text: str) -> List[Dict[str, Any]]:
         """
         Extract named entities from content
@@ -105,7 +162,7 @@ class AIProcessor:
             truncated_content = text[:10000]
             
             # Send request to the AI endpoint
-            response = requests.post(
+            response = self.http.post(
                 endpoint,
                 json={"text": truncated_content},
                 timeout=30
@@ -142,7 +199,7 @@ class AIProcessor:
             truncated_context = context[:15000]
             
             # Send request to the AI endpoint
-            response = requests.post(
+            response = self.http.post(
                 endpoint,
                 json={"context": truncated_context, "question": question},
                 timeout=30
@@ -179,7 +236,7 @@ class AIProcessor:
                 files = {"file": (os.path.basename(image_path), img_file)}
                 
                 # Send request to the AI endpoint
-                response = requests.post(
+                response = self.http.post(
                     endpoint,
                     files=files,
                     timeout=60
@@ -216,7 +273,7 @@ class AIProcessor:
                 files = {"file": (os.path.basename(image_path), img_file)}
                 
                 # Send request to the AI endpoint
-                response = requests.post(
+                response = self.http.post(
                     endpoint,
                     files=files,
                     timeout=60
@@ -253,7 +310,7 @@ class AIProcessor:
                 files = {"file": (os.path.basename(image_path), img_file)}
                 
                 # Send request to the AI endpoint
-                response = requests.post(
+                response = self.http.post(
                     endpoint,
                     files=files,
                     timeout=60
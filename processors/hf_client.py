@@ -0,0 +1,139 @@
+"""
+Batching client for the Hugging Face API
+
+Collects requests for the single-item endpoints and sends them together
+through the /process/batch endpoint.
+"""
+import logging
+import asyncio
+from typing import Dict, List, Any, Callable, Awaitable
+
+from config.settings import (
+    HF_API_ENDPOINTS,
+    HF_BATCH_SIZE,
+    HF_BATCH_FLUSH_INTERVAL,
+    HF_BATCH_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+class HFBatchClient:
+    """Coalesce per-item API calls into /process/batch requests"""
+    
+    def __init__(self, get_session: Callable[[], Awaitable[Any]],
+                 batch_size: int = HF_BATCH_SIZE,
+                 flush_interval: float = HF_BATCH_FLUSH_INTERVAL):
+        """
+        Initialize the batch client
+        
+        Args:
+            get_session: Coroutine function returning an aiohttp session
+            batch_size: Maximum number of items sent in one request
+            flush_interval: Seconds to wait for more items before sending a partial batch
+        """
+        self.get_session = get_session
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.endpoint = HF_API_ENDPOINTS.get("process_batch")
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+    
+    def submit(self, task: str, payload: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queue one item for the given task
+        
+        Args:
+            task: Name of the single-item endpoint (e.g. 'classify_document')
+            payload: Request body that would be sent to that endpoint
+        
+        Returns:
+            Future resolved with the item's result, or None if the batch failed
+        """
+        future = asyncio.get_running_loop().create_future()
+        
+        if task not in self._queues:
+            self._queues[task] = asyncio.Queue()
+        self._queues[task].put_nowait((payload, future))
+        
+        worker = self._workers.get(task)
+        if worker is None or worker.done():
+            self._workers[task] = asyncio.create_task(self._drain(task))
+        
+        return future
+    
+    async def _drain(self, task: str) -> None:
+        """
+        Send queued items for a task in batches until cancelled
+        
+        Args:
+            task: Name of the task whose queue is drained
+        """
+        queue = self._queues[task]
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.flush_interval
+            
+            # Keep collecting until the batch is full or the interval ends
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            await self._send(task, batch)
+    
+    async def _send(self, task: str, batch: List[tuple]) -> None:
+        """
+        Post one batch and resolve the futures of its items
+        
+        Args:
+            task: Name of the task
+            batch: List of (payload, future) pairs
+        """
+        results: List[Any] = []
+        try:
+            session = await self.get_session()
+            if session is None or not self.endpoint:
+                raise RuntimeError("Batch endpoint not available")
+            
+            async with session.post(
+                self.endpoint,
+                json={"task": task, "items": [payload for payload, _ in batch]},
+                timeout=HF_BATCH_TIMEOUT
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    results = result.get("results", [])
+                else:
+                    logger.warning(f"Batch API returned error for {task}: {response.status}")
+        except Exception as e:
+            logger.error(f"Error sending {task} batch of {len(batch)} items: {e}")
+        finally:
+            # Resolve every future, even if the worker is being cancelled
+            if len(results) != len(batch):
+                if results:
+                    logger.warning(f"Batch API returned {len(results)} results for {len(batch)} {task} items")
+                results = [None] * len(batch)
+            
+            for (_, future), item_result in zip(batch, results):
+                if not future.done():
+                    future.set_result(item_result)
+    
+    async def close(self) -> None:
+        """Stop the background workers and fail any pending items"""
+        for worker in self._workers.values():
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        
+        for queue in self._queues.values():
+            while not queue.empty():
+                _, future = queue.get_nowait()
+                if not future.done():
+                    future.set_result(None)
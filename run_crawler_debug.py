@@ -36,8 +36,9 @@ DEFAULT_LOG_FILE = os.path.join(LOGS_DIR, f"crawler_{timestamp}.log")
 
 # Import project modules (after path setup)
 from config.settings import LOG_LEVEL
-from config.targets import TARGET_COLLEGES
+from config.targets import TARGET_COLLEGES, get_by_alias
 from utils.helpers import setup_logging
+from crawler.browser import BrowserPool
 from crawler.crawler import CollegeCrawler
 from processors.ai_processor import AIProcessor
 from storage.mongodb import MongoDBConnector
@@ -74,6 +75,7 @@ async def test_browser():
         await crawler.init_browser()
         vs_logger.info("✅ Browser initialized successfully")
         await crawler.close()
+        await BrowserPool.shutdown()
         return True
     except Exception as e:
         vs_logger.error(f"❌ Browser initialization failed: {e}")
@@ -288,7 +290,7 @@ async def main():
     parser.add_argument('--list', action='store_true', help='List available target colleges')
     parser.add_argument('--process-only', action='store_true', help='Only process existing data, no crawling')
     parser.add_argument('--dry-run', action='store_true', help='Count data but do not process (with --process-only)')
-    parser.add_argument('--no-browser', action='store_true', help='Disable browser automation (use requests only)')
+    parser.add_argument('--no-browser', action='store_true', help='Disable browser automation (plain HTTP fetching only)')
     parser.add_argument('--use-proxies', action='store_true', help='Enable proxy rotation')
     parser.add_argument('--max-pages', type=int, help='Maximum pages to crawl per college')
     parser.add_argument('--debug', action='store_true', help='Enable extended debugging features')
@@ -337,13 +339,16 @@ async def main():
             "placement_paths": [],
             "domain": urlparse(args.url).netloc
         }
-        await crawl_college(
-            custom_college, 
-            use_browser=not args.no_browser,
-            use_proxies=args.use_proxies,
-            max_pages=args.max_pages,
-            debug=args.debug
-        )
+        try:
+            await crawl_college(
+                custom_college, 
+                use_browser=not args.no_browser,
+                use_proxies=args.use_proxies,
+                max_pages=args.max_pages,
+                debug=args.debug
+            )
+        finally:
+            await BrowserPool.shutdown()
         vs_logger.info("Crawling complete. Starting data processing...")
         await process_crawled_data("Custom URL")
         vs_logger.info(f"All operations completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -352,7 +357,9 @@ async def main():
     # Filter colleges by name if specified
     colleges_to_crawl = []
     if args.college:
-        for college in TARGET_COLLEGES:
+        # An exact name/alias is an index hit, otherwise fall back to substring matching
+        exact = get_by_alias(args.college)
+        for college in ([exact] if exact else TARGET_COLLEGES):
             # Check both name and aliases
             if args.college.lower() in college['name'].lower():
                 colleges_to_crawl.append(college)
@@ -378,15 +385,18 @@ async def main():
     
     vs_logger.info(f"Will crawl {len(colleges_to_crawl)} colleges")
     
-    # Crawl each college sequentially
-    for college in colleges_to_crawl:
-        await crawl_college(
-            college, 
-            use_browser=not args.no_browser,
-            use_proxies=args.use_proxies,
-            max_pages=args.max_pages,
-            debug=args.debug
-        )
+    # Crawl each college sequentially (sharing one browser)
+    try:
+        for college in colleges_to_crawl:
+            await crawl_college(
+                college, 
+                use_browser=not args.no_browser,
+                use_proxies=args.use_proxies,
+                max_pages=args.max_pages,
+                debug=args.debug
+            )
+    finally:
+        await BrowserPool.shutdown()
     
     # Process the crawled data
     vs_logger.info("Crawling complete. Starting data processing...")
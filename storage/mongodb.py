@@ -136,21 +136,44 @@ class MongoDBConnector:
             logger.error(f"Failed to get raw data: {e}")
             raise
     
-    def get_processed_data(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def get_processed_data(
+        self, 
+        query: Dict[str, Any], 
+        projection: Optional[Dict[str, Any]] = None, 
+        limit: int = 0
+    ) -> List[Dict[str, Any]]:
         """
         Get processed data from processed_collection based on query
         
         Args:
             query: Query to filter documents
+            projection: Fields to return (all fields if None)
+            limit: Maximum number of documents to return (0 for no limit)
             
         Returns:
             List[Dict[str, Any]]: List of matching processed data documents
         """
         try:
-            return list(self.processed_collection.find(query))
+            return list(self.processed_collection.find(query, projection).limit(limit))
         except PyMongoError as e:
             logger.error(f"Failed to get processed data: {e}")
             raise
+    
+    def count_processed_data(self, query: Dict[str, Any]) -> int:
+        """
+        Count processed data documents matching a query
+        
+        Args:
+            query: Query to filter documents
+            
+        Returns:
+            int: Number of matching documents
+        """
+        try:
+            return self.processed_collection.count_documents(query)
+        except PyMongoError as e:
+            logger.error(f"Failed to count processed data: {e}")
+            raise
             
     def get_college_data(self, college_name: str, data_type: str) -> Dict[str, Any]:
         """
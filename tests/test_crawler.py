@@ -5,15 +5,22 @@ import os
 import asyncio
 import unittest
 import sys
+import tempfile
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from crawler.browser import BrowserManager
+from crawler.browser import BrowserManager, SimpleBrowser
 from crawler.crawler import CollegeCrawler
 from extractors.base import BaseExtractor
 from extractors.admission import AdmissionExtractor
 from extractors.placement import PlacementExtractor
+from extractors.pdf import PDFExtractor
+from config.targets import ADMISSION_URL_RE, PLACEMENT_URL_RE, classify_url_path, get_by_domain, get_by_alias
+from processors.hf_client import HFBatchClient
+from crawler.httpcache import HTTPCache
+from urllib.parse import urljoin
+from crawler.urlutils import canonicalize_url, url_fingerprint, fast_urljoin
 
 class TestBrowserManager(unittest.TestCase):
     """Tests for the BrowserManager class"""
@@ -42,6 +49,49 @@ class TestBrowserManager(unittest.TestCase):
         if self.browser_manager:
             await self.browser_manager.close()
 
+class TestSimpleBrowser(unittest.TestCase):
+    """Tests for the SimpleBrowser class"""
+    
+    def setUp(self):
+        """Set up test case"""
+        self.browser = SimpleBrowser()
+        self.browser.current_url = "https://test.com/admissions/"
+        self.browser.current_content = """
+        <html>
+            <body>
+                <a href="ug.html">UG Admissions</a>
+                <a href="brochure.PDF">Brochure</a>
+                <a href="https://www.example.com">Example Link</a>
+                <a href="mailto:office@test.com">Mail</a>
+            </body>
+        </html>
+        """
+    
+    def test_get_links(self):
+        """Test link extraction from the last fetched page"""
+        page_links, file_links = asyncio.run(self.browser.get_links())
+        self.assertEqual(page_links, ["https://test.com/admissions/ug.html", "https://www.example.com"])
+        self.assertEqual(file_links, ["https://test.com/admissions/brochure.PDF"])
+
+class TestHTTPCache(unittest.TestCase):
+    """Tests for the HTTPCache class"""
+    
+    def test_round_trip(self):
+        """Test that stored pages survive reopening the cache"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            cache = HTTPCache(path, expire_after=60)
+            cache.put("http://a.test/", "http://a.test/home", "<html></html>", etag='"v1"')
+            cache.close()
+            
+            cache = HTTPCache(path, expire_after=60)
+            entry = cache.get("http://a.test/")
+            self.assertEqual(entry['content'], "<html></html>")
+            self.assertTrue(cache.is_fresh(entry))
+            self.assertEqual(cache.validators(entry), {'If-None-Match': '"v1"'})
+            self.assertIsNone(cache.get("http://b.test/"))
+            cache.close()
+
 class TestBaseExtractor(unittest.TestCase):
     """Tests for the BaseExtractor class"""
     
@@ -71,6 +121,13 @@ class TestBaseExtractor(unittest.TestCase):
         self.assertIn("Test Page", text)
         self.assertIn("This is a test paragraph", text)
     
+    def test_extract_text_skips_hidden_children(self):
+        """Test that script text inside a paragraph is left out"""
+        text = self.extractor.extract_text('<p>Fees <script>var x=1</script> 2024</p><p>Other</p>')
+        self.assertIn("Fees 2024", text)
+        self.assertIn("Other", text)
+        self.assertNotIn("var x", text)
+    
     def test_extract_tables(self):
         """Test table extraction"""
         tables = self.extractor.extract_tables(self.sample_html)
@@ -85,6 +142,163 @@ class TestBaseExtractor(unittest.TestCase):
         self.assertEqual(links[0]['url'], "https://www.example.com")
         self.assertEqual(links[0]['text'], "Example Link")
 
+    def test_extract_all_parses_once(self):
+        """Test that the helpers share one parsed tree per page"""
+        result = self.extractor.extract_all(self.sample_html, "https://test.com")
+        tree = self.extractor._tree_cache[1]
+        self.assertIn("Test Page", result['text'])
+        self.assertEqual(len(result['tables']), 1)
+        self.assertEqual(len(result['links']), 1)
+        self.assertIs(self.extractor._parse(self.sample_html), tree)
+
+class TestCollegeCrawler(unittest.TestCase):
+    """Tests for the CollegeCrawler class"""
+    
+    def test_filter_links_types(self):
+        """Test that links only get a type from their own URL"""
+        # _filter_links uses no crawler state, so skip the database connection
+        crawler = CollegeCrawler.__new__(CollegeCrawler)
+        links = crawler._filter_links([
+            "https://x.edu/about-us",
+            "https://x.edu/admissions/ug",
+            "https://x.edu/placements",
+            "https://y.edu/admissions"
+        ], "x.edu")
+        self.assertEqual(links, [
+            ("https://x.edu/about-us", None),
+            ("https://x.edu/admissions/ug", "admission"),
+            ("https://x.edu/placements", "placement")
+        ])
+
+class TestPDFExtractor(unittest.TestCase):
+    """Tests for the PDFExtractor class"""
+    
+    def test_ruled_table(self):
+        """Test that a table drawn with lines is found with its header"""
+        import fitz
+        doc = fitz.open()
+        page = doc.new_page()
+        for i in range(4):
+            page.draw_line((72, 100 + i * 20), (372, 100 + i * 20))
+            page.draw_line((72 + i * 100, 100), (72 + i * 100, 160))
+        for r, row in enumerate([["Course", "Fee", "Seats"], ["BTech", "1,00,000", "120"], ["MTech", "80,000", "60"]]):
+            for c, value in enumerate(row):
+                page.insert_text((76 + c * 100, 115 + r * 20), value)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.pdf")
+            doc.save(path)
+            result = PDFExtractor().extract_from_pdf(path)
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(len(result['tables']), 1)
+        self.assertEqual(result['tables'][0]['headers'], ["Course", "Fee", "Seats"])
+        self.assertEqual(result['tables'][0]['rows'], [["BTech", "1,00,000", "120"], ["MTech", "80,000", "60"]])
+        self.assertEqual(result['tables'][0]['table_id'], "page1_table1")
+
+class TestURLPatterns(unittest.TestCase):
+    """Tests for the precompiled URL pattern regexes"""
+    
+    def test_admission_patterns(self):
+        """Test admission URL classification"""
+        self.assertTrue(ADMISSION_URL_RE.search("/Admissions/UG"))
+        self.assertTrue(ADMISSION_URL_RE.search("/fee-structure"))
+        self.assertIsNone(ADMISSION_URL_RE.search("/about-us"))
+    
+    def test_placement_patterns(self):
+        """Test placement URL classification"""
+        self.assertTrue(PLACEMENT_URL_RE.search("/training_and_placement"))
+        self.assertTrue(PLACEMENT_URL_RE.search("/careers"))
+        self.assertIsNone(PLACEMENT_URL_RE.search("/about-us"))
+        self.assertEqual(classify_url_path("/admissions/placement-stats"), "placement")
+    
+    def test_college_lookup(self):
+        """Test target college lookup by domain and alias"""
+        self.assertEqual(get_by_domain("home.IITD.ac.in")["alias"], ["IIT Delhi", "IITD"])
+        self.assertIs(get_by_alias(" iit delhi "), get_by_domain("iitd.ac.in"))
+        self.assertIsNone(get_by_domain("example.com"))
+
+class FakeBatchResponse:
+    """Minimal stand-in for an aiohttp response to a batch request"""
+    
+    def __init__(self, items):
+        self.status = 200
+        self.items = items
+    
+    async def json(self):
+        return {"results": [{"echo": item["text"]} for item in self.items]}
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeBatchSession:
+    """Records batch requests instead of sending them"""
+    
+    def __init__(self):
+        self.requests = []
+    
+    def post(self, url, json=None, timeout=None):
+        self.requests.append(json)
+        return FakeBatchResponse(json["items"])
+
+class TestURLCanonicalization(unittest.TestCase):
+    """Tests for URL canonicalization and fingerprints"""
+    
+    def test_canonicalize_url(self):
+        """Test that equivalent URLs share a canonical form"""
+        self.assertEqual(
+            canonicalize_url("HTTPS://Www.IITD.ac.in:443/Admissions?b=2&utm_source=x&a=1#top"),
+            "https://www.iitd.ac.in/Admissions?a=1&b=2"
+        )
+        self.assertEqual(canonicalize_url("http://x.edu"), "http://x.edu/")
+        self.assertEqual(
+            url_fingerprint("http://x.edu/a?fbclid=123"),
+            url_fingerprint("http://X.edu/a")
+        )
+        self.assertNotEqual(url_fingerprint("http://x.edu/a"), url_fingerprint("http://x.edu/b"))
+    
+    def test_fast_urljoin(self):
+        """Test that fast_urljoin agrees with urljoin"""
+        base = "https://x.edu/admissions/ug/index.html?year=2024"
+        for href in ["fees.pdf", "/placements", "//cdn.x.edu/a.png", "http://y.edu/p",
+                     "../brochure.pdf", "?page=2", "#top", "mailto:a@x.edu", "a//b", " b.html"]:
+            self.assertEqual(fast_urljoin(base, href), urljoin(base, href), href)
+        
+        # Empty path segments in the base, invalid IPv6 hosts in the link
+        base = "https://x.edu/a//b/index.html"
+        for href in ["c.html", "/d", "?q=1"]:
+            self.assertEqual(fast_urljoin(base, href), urljoin(base, href), href)
+        for href in ["http://a]b/x", "//a]b/x"]:
+            with self.assertRaises(ValueError):
+                urljoin("https://x.edu/", href)
+            with self.assertRaises(ValueError):
+                fast_urljoin("https://x.edu/", href)
+
+class TestHFBatchClient(unittest.TestCase):
+    """Tests for the HFBatchClient class"""
+    
+    def test_coalesces_items(self):
+        """Test that concurrent submissions share batch requests"""
+        session = FakeBatchSession()
+        
+        async def get_session():
+            return session
+        
+        async def run():
+            client = HFBatchClient(get_session, batch_size=4, flush_interval=0.01)
+            futures = [client.submit("classify_document", {"text": str(i)}) for i in range(6)]
+            results = await asyncio.gather(*futures)
+            await client.close()
+            return results
+        
+        results = asyncio.run(run())
+        self.assertEqual([r["echo"] for r in results], [str(i) for i in range(6)])
+        self.assertEqual([len(r["items"]) for r in session.requests], [4, 2])
+        self.assertEqual(session.requests[0]["task"], "classify_document")
+
 # Define test runner
 def run_async_test(test_case):
     """Run async test case"""
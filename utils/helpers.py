@@ -13,6 +13,8 @@ from urllib.parse import urlparse, urljoin
 import requests
 from datetime import datetime
 
+from config.settings import MIME_TO_CATEGORY
+
 logger = logging.getLogger(__name__)
 
 def setup_logging(log_level: str, log_file: str = None) -> None:
@@ -164,6 +166,19 @@ def clean_text(text: str) -> str:
     
     return cleaned
 
+def node_text_lines(node: Any) -> str:
+    """
+    Get the stripped text of a selectolax node, one text fragment per line
+    
+    Args:
+        node: selectolax node or parser
+        
+    Returns:
+        Text with empty fragments dropped
+    """
+    text = node.text(separator='\n', strip=True)
+    return "\n".join(line for line in text.split('\n') if line)
+
 def extract_numbers(text: str) -> List[float]:
     """
     Extract numbers from text
@@ -438,6 +453,20 @@ def get_content_type(url: str) -> Optional[str]:
         logger.debug(f"Error getting content type for {url}: {e}")
         return None
 
+def get_content_category(content_type: str) -> Optional[str]:
+    """
+    Map a Content-Type header value to a CONTENT_TYPES category
+    
+    Args:
+        content_type: Content-Type value, parameters allowed (e.g. 'text/html; charset=utf-8')
+        
+    Returns:
+        Category name or None if the MIME type is not known
+    """
+    if not content_type:
+        return None
+    return MIME_TO_CATEGORY.get(content_type.split(';', 1)[0].strip().lower())
+
 def normalize_url(url: str, base_url: str = None) -> str:
     """
     Normalize a URL